@@ -0,0 +1,74 @@
+"""
+Measure how EntryForest.build scales with the number of entries.
+
+Synthetic href forests of 10^3 to 10^6 entries are built in memory: wide feeds
+with many usage points, meter readings and sibling interval blocks, and a single
+related chain as deep as the feed is large.
+
+Run with ``python benchmarks/entry_forest_scaling.py [--max-exponent 6]``.
+"""
+
+import argparse
+import gc
+import time
+
+from greenbutton_objects.atom import EntryForest, HRefForest
+from greenbutton_objects.atom.href_forest import HRefTreeNode
+from greenbutton_objects.data import espi
+
+BLOCKS_PER_METER = 96
+
+
+def wide_forest(entries: int) -> HRefForest:
+    """Usage points with one meter reading and many interval blocks each."""
+    href_forest = HRefForest()
+    forest = href_forest.forest
+    up_index = 0
+    while len(forest) < entries:
+        up_uri = f"UsagePoint/{up_index}"
+        mr_container = f"{up_uri}/MeterReading"
+        mr_uri = f"{mr_container}/0"
+        ib_container = f"{mr_uri}/IntervalBlock"
+        forest[up_uri] = HRefTreeNode(
+            uri=up_uri, parent="UsagePoint", contentType=espi.UsagePoint, related=[mr_container]
+        )
+        forest[mr_uri] = HRefTreeNode(
+            uri=mr_uri, parent=mr_container, contentType=espi.MeterReading, related=[ib_container]
+        )
+        for block in range(BLOCKS_PER_METER):
+            ib_uri = f"{ib_container}/{block}"
+            forest[ib_uri] = HRefTreeNode(uri=ib_uri, parent=ib_container, contentType=espi.IntervalBlock)
+        up_index += 1
+    return href_forest.link()
+
+
+def deep_forest(entries: int) -> HRefForest:
+    """A single chain of entries, each related to the next one."""
+    href_forest = HRefForest()
+    for index in range(entries):
+        uri = f"Chain/{index}"
+        related = [f"Chain/{index + 1}"] if index + 1 < entries else []
+        href_forest.forest[uri] = HRefTreeNode(uri=uri, contentType=espi.MeterReading, related=related)
+    return href_forest.link()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--max-exponent", type=int, default=6)
+    args = arg_parser.parse_args()
+
+    print("%-6s %10s %12s %14s" % ("shape", "entries", "build", "per entry"))
+    for exponent in range(3, args.max_exponent + 1):
+        for shape, make_forest in (("wide", wide_forest), ("deep", deep_forest)):
+            href_forest = make_forest(10**exponent)
+            gc.collect()
+            start = time.perf_counter()
+            EntryForest().build(href_forest)
+            elapsed = time.perf_counter() - start
+            entries = len(href_forest.forest)
+            print("%-6s %10d %11.3fs %12.2fus" % (shape, entries, elapsed, elapsed / entries * 1e6))
+            del href_forest
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare the generic xsdata binding of IntervalBlocks with the fast-path decoder
+used by ``parse.parse_feed`` on the bundled electricity feeds.
+
+Run with ``python benchmarks/interval_decoder.py``.
+"""
+
+import pathlib
+import time
+import warnings
+from typing import Callable
+
+from greenbutton_objects import parse
+from greenbutton_objects.atom import EntryForest, HRefForest
+from greenbutton_objects.feed.feed import ObjectFeed
+
+_DATA_DIR = pathlib.Path(__file__).parent.parent / "tests" / "data" / "electricity"
+
+
+def parse_generic(filename: str) -> ObjectFeed:
+    data = parse.parse_xml(filename)
+    return ObjectFeed().build(EntryForest().build(HRefForest().build(data)))
+
+
+def best_time(func: Callable[[str], ObjectFeed], filename: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(filename)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat: int = 3) -> None:
+    warnings.simplefilter("ignore")
+    parse.warmup()
+
+    total_generic = total_fast = 0.0
+    print("%-75s %10s %10s %8s" % ("file", "xsdata", "decoder", "speedup"))
+    for data_file in sorted(_DATA_DIR.iterdir()):
+        generic = best_time(parse_generic, str(data_file), repeat)
+        fast = best_time(parse.parse_feed, str(data_file), repeat)
+        total_generic += generic
+        total_fast += fast
+        print("%-75s %9.3fs %9.3fs %7.1fx" % (data_file.name, generic, fast, generic / fast))
+    print("%-75s %9.3fs %9.3fs %7.1fx" % ("total", total_generic, total_fast, total_generic / total_fast))
+
+
+if __name__ == "__main__":
+    main()
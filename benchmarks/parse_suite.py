@@ -0,0 +1,143 @@
+"""
+Parse throughput, per-stage latency and peak memory of ``parse.parse_feed``.
+
+Every feed in ``tests/data`` is measured, together with synthetic containerized
+feeds of 1, 10 and 100 meter-years of 15 minute readings, one meter reading per
+usage point and one interval block per day, see ``greenbutton_objects.synthetic``.
+
+Each feed is parsed eagerly, as ``parse_feed`` does by default, and with
+``lazy=True``; result names end in the mode, e.g. ``abridged/gas_direct.xml [eager]``.
+
+Results are written as JSON so runs of different releases can be compared:
+
+    python benchmarks/parse_suite.py --output before.json
+    python benchmarks/parse_suite.py --output after.json --compare before.json
+
+Use ``--meter-years 1 10`` to skip the largest synthetic feed and ``--modes eager``
+to measure the default mode only.
+"""
+
+import argparse
+import dataclasses
+import json
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from greenbutton_objects import __version__, parse
+from greenbutton_objects.profiling import ParseProfiler
+from greenbutton_objects.synthetic import FeedSpec, write_feed
+
+_DATA_DIR = pathlib.Path(__file__).parent.parent / "tests" / "data"
+
+METER_YEAR = FeedSpec(interval_length=15 * 60, span=365 * 24 * 3600)
+
+MODES = {"eager": False, "lazy": True}
+
+
+def measure(name: str, path: pathlib.Path, repeat: int, mode: str) -> Dict[str, Any]:
+    lazy = MODES[mode]
+    best: List[Any] = []
+    best_wall = float("inf")
+    for _ in range(repeat):
+        profiler = ParseProfiler()
+        start = time.perf_counter()
+        parse.parse_feed(str(path), lazy=lazy, profiler=profiler)
+        wall = time.perf_counter() - start
+        if wall < best_wall:
+            best_wall, best = wall, profiler.stages
+
+    # Memory tracing slows parsing down, so it gets a run of its own
+    memory_profiler = ParseProfiler(trace_memory=True)
+    parse.parse_feed(str(path), lazy=lazy, profiler=memory_profiler)
+
+    size = path.stat().st_size
+    readings = best[-1].counts["readings"]
+    return {
+        "name": f"{name} [{mode}]",
+        "mode": mode,
+        "bytes": size,
+        "readings": readings,
+        "wall_time": best_wall,
+        "cpu_time": sum(stats.cpu_time for stats in best),
+        "readings_per_second": readings / best_wall,
+        "megabytes_per_second": size / 2**20 / best_wall,
+        "peak_memory": max(stats.peak_memory or 0 for stats in memory_profiler.stages),
+        "stages": {
+            stats.name: {"wall_time": stats.wall_time, "cpu_time": stats.cpu_time, "counts": stats.counts}
+            for stats in best
+        },
+        "stage_peak_memory": {stats.name: stats.peak_memory for stats in memory_profiler.stages},
+    }
+
+
+def print_result(result: Dict[str, Any], baseline: Dict[str, Dict[str, Any]]) -> None:
+    name = result["name"]
+    if len(name) > 60:
+        # Keep the mode at the end of the name
+        name = "..." + name[-57:]
+    line = "%-60s %9.1f MB/s %12.0f readings/s %9.1f MiB" % (
+        name,
+        result["megabytes_per_second"],
+        result["readings_per_second"],
+        result["peak_memory"] / 2**20,
+    )
+    previous = baseline.get(result["name"])
+    if previous:
+        line += "  %+6.1f%%" % ((previous["wall_time"] / result["wall_time"] - 1) * 100)
+    print(line, file=sys.stderr)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    arg_parser.add_argument("--output", type=pathlib.Path, help="write JSON results here instead of stdout")
+    arg_parser.add_argument("--compare", type=pathlib.Path, help="JSON results of a previous run")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="timing runs per feed, the best is kept")
+    arg_parser.add_argument("--meter-years", type=int, nargs="*", default=[1, 10, 100])
+    arg_parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    args = arg_parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    parse.warmup()
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.compare:
+        baseline = {result["name"]: result for result in json.loads(args.compare.read_text())["results"]}
+
+    results = []
+    for data_file in sorted(_DATA_DIR.rglob("*.xml")):
+        for mode in args.modes:
+            results.append(measure(str(data_file.relative_to(_DATA_DIR)), data_file, args.repeat, mode))
+            print_result(results[-1], baseline)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for meter_years in args.meter_years:
+            path = pathlib.Path(tmp_dir) / f"synthetic_{meter_years}.xml"
+            write_feed(dataclasses.replace(METER_YEAR, usage_points=meter_years), path)
+            for mode in args.modes:
+                results.append(measure(f"synthetic/{meter_years}_meter_years", path, args.repeat, mode))
+                print_result(results[-1], baseline)
+            path.unlink()
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from greenbutton_objects.atom.entry_forest import EntryForest
+from greenbutton_objects.atom.entry_reader import EntryReader
 from greenbutton_objects.atom.href_forest import HRefForest
 
 __all__ = [
     "HRefForest",
     "EntryForest",
+    "EntryReader",
 ]
@@ -1,8 +1,9 @@
 from dataclasses import dataclass, field
 from itertools import chain
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from greenbutton_objects.atom.href_forest import HRefForest, HRefTreeNode
+from greenbutton_objects.objects.columns import ReadingColumns
 from greenbutton_objects.util import get_first
 
 
@@ -16,8 +17,10 @@ class EntryNode:
     content_type: type = type(None)
     children_type: type = type(None)
     children: List["EntryNode"] = field(default_factory=list)
-    # TODO: Should related be a list or dict keyed by type?
     related: List["EntryNode"] = field(default_factory=list)
+    interval_columns: Optional[List[ReadingColumns]] = None
+    # Index of ``related`` built by ``index_related``, see ``get_related_of_type``
+    related_by_type: Dict[type, List["EntryNode"]] = field(default_factory=dict, repr=False, compare=False)
 
     def infer_children_type(self) -> None:
         # We are making a big assumption here that all children are of the same type.
@@ -35,14 +38,12 @@ class EntryNode:
         return get_first(first_node_content)
 
     def get_related_of_type(self, elements_type: type) -> Iterable["EntryNode"]:
-        containers = [obj for obj in self.related if obj.children_type is elements_type]
-        if containers:
-            elements: Iterable[EntryNode] = chain.from_iterable(
-                container.children for container in containers
-            )
-        else:
-            elements = [obj for obj in self.related if obj.content_type is elements_type]
-        return elements
+        if self.related_by_type:
+            return self.related_by_type.get(elements_type, [])
+        return EntryForest.get_elements_by_type(elements_type, self.related)
+
+    def index_related(self) -> None:
+        self.related_by_type = index_elements_by_type(self.related)
 
     def safe_get_content(self, content_type: type) -> Union[Any, None]:
         obj = get_first(self.get_related_of_type(content_type))
@@ -54,42 +55,56 @@ class EntryForest:
         self,
     ) -> None:
         self.__roots: List[EntryNode] = []
+        self.__roots_by_type: Dict[type, List[EntryNode]] = {}
+        self.__node_count = 0
 
     def build(self, href_forest: HRefForest) -> "EntryForest":
         node_cache: Dict[str, EntryNode] = {}
+        # Nodes that were created but whose links have not been resolved yet
+        worklist: List[Tuple[HRefTreeNode, EntryNode]] = []
 
-        def add_node(href_node: HRefTreeNode) -> EntryNode:
-            entry_node = EntryNode(
-                title=href_node.title,
-                uri=href_node.uri,
-                content=href_node.content,
-                content_type=href_node.contentType,
-            )
-            node_cache[href_node.uri] = entry_node
+        def get_node(node_uri: str) -> EntryNode:
+            entry_node = node_cache.get(node_uri)
+            if entry_node is None:
+                href_node = href_forest.forest[node_uri]
+                entry_node = EntryNode(
+                    title=href_node.title,
+                    uri=href_node.uri,
+                    content=href_node.content,
+                    content_type=href_node.contentType,
+                    interval_columns=href_node.interval_columns,
+                )
+                node_cache[node_uri] = entry_node
+                worklist.append((href_node, entry_node))
             return entry_node
 
-        def build_tree(node_uri: str) -> EntryNode:
-            if node_uri not in node_cache:
-                href_node = href_forest.forest[node_uri]
-                entry_node = add_node(href_node)
+        self.__roots = [get_node(uri) for uri in href_forest.root_nodes()]
 
-                # Children
-                entry_node.children = [build_tree(child) for child in href_node.children]
-                for child in entry_node.children:
-                    child.parent = entry_node
-                entry_node.infer_children_type()
+        while worklist:
+            href_node, entry_node = worklist.pop()
 
-                # Relatives
-                entry_node.related = [build_tree(child) for child in href_node.related]
+            # Children
+            entry_node.children = [get_node(child) for child in href_node.children]
+            for child in entry_node.children:
+                child.parent = entry_node
+            entry_node.infer_children_type()
 
-            return node_cache[node_uri]
+            # Relatives
+            entry_node.related = [get_node(child) for child in href_node.related]
 
-        self.__roots = [build_tree(uri) for uri in href_forest.root_nodes()]
+        # Every children_type is known only once all nodes are linked
+        for entry_node in node_cache.values():
+            entry_node.index_related()
+        self.__roots_by_type = index_elements_by_type(self.__roots)
+        self.__node_count = len(node_cache)
 
         return self
 
+    def __len__(self) -> int:
+        return self.__node_count
+
     @staticmethod
-    def get_elements_by_type(elements_type: type, source: list[EntryNode]) -> Iterable[EntryNode]:
+    def get_elements_by_type(elements_type: type, source: List[EntryNode]) -> Iterable[EntryNode]:
         containers = [obj for obj in source if obj.children_type is elements_type]
         if containers:
             elements: Iterable[EntryNode] = chain.from_iterable(
@@ -99,6 +114,23 @@ class EntryForest:
             elements = [obj for obj in source if obj.content_type is elements_type]
         return elements
 
+    def get_root_elements_by_type(self, elements_type: type) -> List[EntryNode]:
+        return self.__roots_by_type.get(elements_type, [])
+
     @property
     def roots(self) -> List[EntryNode]:
         return self.__roots
+
+
+def index_elements_by_type(source: List[EntryNode]) -> Dict[type, List[EntryNode]]:
+    """Precompute ``EntryForest.get_elements_by_type`` for every type found in ``source``."""
+    containers: Dict[type, List[EntryNode]] = {}
+    elements: Dict[type, List[EntryNode]] = {}
+    for obj in source:
+        containers.setdefault(obj.children_type, []).append(obj)
+        elements.setdefault(obj.content_type, []).append(obj)
+
+    index = elements
+    for children_type, type_containers in containers.items():
+        index[children_type] = [child for container in type_containers for child in container.children]
+    return index
@@ -0,0 +1,49 @@
+from typing import IO, Iterator, Optional, Union
+from xml.etree import ElementTree
+
+from xsdata.formats.dataclass.parsers import XmlParser
+
+from greenbutton_objects.data.atom import Entry, EntryType
+
+ATOM_ENTRY_TAG = "{http://www.w3.org/2005/Atom}entry"
+
+
+class EntryReader:
+    """Incrementally read the entries of an atom feed.
+
+    Each ``<entry>`` element is bound with xsdata as soon as it is complete and then
+    removed from the partially built document, so only one entry worth of XML is held
+    in memory at a time.
+    """
+
+    def __init__(self, parser: XmlParser) -> None:
+        self.parser = parser
+
+    def read(self, source: Union[str, IO[bytes]]) -> Iterator[EntryType]:
+        for element in self.iter_elements(source):
+            yield self.bind(element)
+
+    def bind(self, element: ElementTree.Element) -> EntryType:
+        entry: EntryType = self.parser.parse(element, Entry)
+        return entry
+
+    @staticmethod
+    def iter_elements(source: Union[str, IO[bytes]]) -> Iterator[ElementTree.Element]:
+        """Yield every complete ``<entry>`` element and discard it afterwards."""
+        root: Optional[ElementTree.Element] = None
+        depth = 0
+        for event, element in ElementTree.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+
+            depth -= 1
+            if element.tag != ATOM_ENTRY_TAG:
+                continue
+
+            yield element
+            element.clear()
+            if depth == 1 and root is not None:
+                root.remove(element)
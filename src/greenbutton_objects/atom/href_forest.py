@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 from greenbutton_objects.data.atom import ContentType, EntryType, Feed
+from greenbutton_objects.objects.columns import ReadingColumns
+from greenbutton_objects.util import InternPool
 
 
 @dataclass
@@ -13,11 +15,16 @@ class HRefTreeNode:
     children: List[str] = field(default_factory=list)
     related: List[str] = field(default_factory=list)
     title: str = ""
+    # Readings of each IntervalBlock in ``content`` decoded before binding, see
+    # ``IntervalBlockReader.read_decoded``
+    interval_columns: Optional[List[ReadingColumns]] = None
 
 
 class HRefForest:
-    def __init__(self) -> None:
+    def __init__(self, pool: Optional[InternPool] = None) -> None:
         self.forest: Dict[str, HRefTreeNode] = {}
+        # Pass the pool of other forests to share their URIs and titles
+        self.pool = pool if pool is not None else InternPool()
 
     def __ensure_container(self, uri: str) -> None:
         if uri not in self.forest:
@@ -41,6 +48,11 @@ class HRefForest:
         return self
 
     def __add_nodes(self, feed: Feed) -> "HRefForest":
+        for entry in feed.entry:
+            self.add_entry(entry)
+        return self
+
+    def add_entry(self, entry: EntryType) -> HRefTreeNode:
         def entry_content_type(entry: EntryType) -> type:
             if entry.content and entry.content[0].content:
                 content_type = type(entry.content[0].content[0])
@@ -48,36 +60,36 @@ class HRefForest:
                 content_type = type(None)
             return content_type
 
-        for entry in feed.entry:
-            related = []
-            parent = None
-            uri = ""
-
-            content_type = entry_content_type(entry)
-
-            for link in entry.link:
-                # Skip links without URIs
-                if not link.href:
-                    continue
-                if link.rel == "self":
-                    uri = link.href
-                elif link.rel == "related":
-                    related.append(link.href)
-                elif link.rel == "up":
-                    parent = link.href
-
-            title = self.get_entry_title(entry)
-
-            self.forest[uri] = HRefTreeNode(
-                uri=uri,
-                title=title,
-                parent=parent,
-                related=related,
-                contentType=content_type,
-                content=entry.content,
-            )
-
-        return self
+        related = []
+        parent = None
+        uri = ""
+
+        content_type = entry_content_type(entry)
+
+        # URIs are repeated in the links of other entries, keep a single copy of each
+        for link in entry.link:
+            # Skip links without URIs
+            if not link.href:
+                continue
+            if link.rel == "self":
+                uri = self.pool.string(link.href)
+            elif link.rel == "related":
+                related.append(self.pool.string(link.href))
+            elif link.rel == "up":
+                parent = self.pool.string(link.href)
+
+        title = self.pool.string(self.get_entry_title(entry))
+
+        node = HRefTreeNode(
+            uri=uri,
+            title=title,
+            parent=parent,
+            related=related,
+            contentType=content_type,
+            content=entry.content,
+        )
+        self.forest[uri] = node
+        return node
 
     @staticmethod
     def get_entry_title(entry: EntryType) -> str:
@@ -91,7 +103,11 @@ class HRefForest:
             return ""
 
     def build(self, feed: Feed) -> "HRefForest":
-        return self.__add_nodes(feed).__ensure_containers().__link_parents()
+        return self.__add_nodes(feed).link()
+
+    def link(self) -> "HRefForest":
+        """Connect nodes added with ``add_entry`` into parent/child trees."""
+        return self.__ensure_containers().__link_parents()
 
     def root_nodes(self) -> List[str]:
         return [node.uri for node in self.forest.values() if node.parent is None]
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+from greenbutton_objects import __version__, parse
+from greenbutton_objects.feed import serialize
+from greenbutton_objects.feed.feed import ObjectFeed
+
+
+class ParseCache:
+    """On-disk cache of parsed feeds.
+
+    Entries are keyed by the SHA-256 of the file content together with the library
+    and serialization format versions, so a changed file or an upgraded library
+    never loads a stale entry. Entries are stored in the compact form of
+    ``feed.serialize``. Once the cache holds more than ``max_bytes`` the least
+    recently used entries are removed.
+    """
+
+    SUFFIX = ".gbof"
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"], max_bytes: int = 1 << 30) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def parse_feed(self, filename: str, lazy: bool = False) -> ObjectFeed:
+        path = self.directory / (self.key(filename) + self.SUFFIX)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            pass
+        else:
+            try:
+                feed = serialize.loads(data, lazy=lazy)
+            except Exception:
+                # A truncated or foreign file, parse again and overwrite it
+                path.unlink(missing_ok=True)
+            else:
+                # The modification time records when the entry was last used
+                os.utime(path)
+                return feed
+
+        feed = parse.parse_feed(filename, lazy=lazy)
+        self.store(path, serialize.dumps(feed))
+        return feed
+
+    @staticmethod
+    def key(filename: str) -> str:
+        digest = hashlib.sha256(f"{__version__}:{serialize.FORMAT_VERSION}:".encode())
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def store(self, path: Path, data: bytes) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            Path(entry_path).unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for entry in self.directory.glob("*" + self.SUFFIX):
+            entry.unlink(missing_ok=True)
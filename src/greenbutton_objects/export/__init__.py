@@ -0,0 +1,24 @@
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import greenbutton_objects.objects as ob
+from greenbutton_objects.feed.feed import ObjectFeed
+from greenbutton_objects.objects.columns import MISSING_CODE
+
+ExportSource = Union[ObjectFeed, Iterable[ob.UsagePoint]]
+
+
+def iter_meter_readings(source: ExportSource) -> Iterator[Tuple[ob.UsagePoint, ob.MeterReading]]:
+    """Meter readings of a parsed feed or of any iterable of usage points."""
+    usage_points = source.usage_points if isinstance(source, ObjectFeed) else source
+    for up in usage_points:
+        for mr in up.meter_readings:
+            yield up, mr
+
+
+def code(value: int) -> Optional[int]:
+    """``None`` for the missing code of the quality, tou and consumption tier columns."""
+    return None if value == MISSING_CODE else value
+
+
+def nan_to_none(value: Optional[float]) -> Optional[float]:
+    return None if value != value else value
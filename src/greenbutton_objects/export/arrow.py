@@ -0,0 +1,122 @@
+"""
+Export interval readings to Apache Arrow and Parquet.
+
+Requires the optional ``pyarrow`` dependency: ``pip install greenbutton_objects[arrow]``.
+"""
+
+from typing import Any, Iterator
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError as error:  # pragma: no cover
+    raise ImportError("Arrow export requires pyarrow, install greenbutton_objects[arrow]") from error
+
+from greenbutton_objects.export import ExportSource, iter_meter_readings
+from greenbutton_objects.objects.columns import MISSING_CODE
+
+DEFAULT_BATCH_SIZE = 1 << 16
+
+URI_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+FIELDS = [
+    ("usage_point", URI_TYPE),
+    ("meter_reading", URI_TYPE),
+    ("start", pa.timestamp("s", tz="UTC")),
+    ("duration", pa.int32()),
+    ("raw_value", pa.float64()),
+    ("value", pa.float64()),
+    ("cost", pa.float64()),
+    ("quality", pa.int8()),
+    ("tou", pa.int64()),
+    ("cpp", pa.int64()),
+    ("consumption_tier", pa.int64()),
+    ("uom", URI_TYPE),
+]
+
+SCHEMA = pa.schema(FIELDS)
+
+
+def column_array(column: Any, arrow_type: Any, offset: int, length: int) -> Any:
+    """Wrap a slice of an ``array.array`` column without copying it."""
+    buffer = pa.py_buffer(column)
+    return pa.Array.from_buffers(arrow_type, length, [None, buffer], offset=offset)
+
+
+def with_nulls(values: Any, missing: Any) -> Any:
+    return pc.if_else(missing, pa.scalar(None, values.type), values)
+
+
+def repeated(value: str, length: int) -> Any:
+    indices = pa.Array.from_buffers(pa.int32(), length, [None, pa.py_buffer(bytes(4 * length))])
+    return pa.DictionaryArray.from_arrays(indices, pa.array([value], pa.string()))
+
+
+def iter_record_batches(source: ExportSource, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Any]:
+    """Yield ``pyarrow.RecordBatch`` objects with ``SCHEMA`` for every meter reading.
+
+    ``source`` is a parsed feed or any iterable of usage points, e.g. the result of
+    ``parse_feed_stream``. Numeric columns are views of the reading columns, URIs
+    and units are dictionary encoded. A meter reading with more than
+    ``batch_size`` readings is split over several batches.
+    """
+    for up, mr in iter_meter_readings(source):
+        columns = mr.columns
+        total = len(columns)
+        scaled = len(columns.value) == total
+        uom = mr.uom_symbol.strip()
+        for offset in range(0, total, batch_size):
+            length = min(batch_size, total - offset)
+
+            def view(column: Any, arrow_type: Any) -> Any:
+                return column_array(column, arrow_type, offset, length)
+
+            raw_value = view(columns.raw_value, pa.float64())
+            cost = view(columns.cost, pa.float64())
+            quality = view(columns.quality, pa.int8())
+            tou = view(columns.tou, pa.int64())
+            tier = view(columns.consumption_tier, pa.int64())
+            value = view(columns.value, pa.float64()) if scaled else pa.nulls(length, pa.float64())
+            yield pa.RecordBatch.from_arrays(
+                [
+                    repeated(up.uri, length),
+                    repeated(mr.uri, length),
+                    view(columns.start, pa.timestamp("s", tz="UTC")),
+                    view(columns.duration, pa.int32()),
+                    with_nulls(raw_value, pc.is_nan(raw_value)),
+                    with_nulls(value, pc.is_nan(value)),
+                    with_nulls(cost, pc.is_nan(cost)),
+                    with_nulls(quality, pc.equal(quality, MISSING_CODE)),
+                    with_nulls(tou, pc.equal(tou, MISSING_CODE)),
+                    view(columns.cpp, pa.int64()),
+                    with_nulls(tier, pc.equal(tier, MISSING_CODE)),
+                    repeated(uom, length),
+                ],
+                schema=SCHEMA,
+            )
+
+
+def to_table(source: ExportSource) -> Any:
+    """Interval readings of ``source`` as a ``pyarrow.Table``."""
+    return pa.Table.from_batches(iter_record_batches(source), schema=SCHEMA)
+
+
+def write_parquet(
+    source: ExportSource,
+    where: Any,
+    row_group_size: int = DEFAULT_BATCH_SIZE,
+    **kwargs: Any,
+) -> int:
+    """Stream the interval readings of ``source`` to a Parquet file.
+
+    Batches are written as they are produced, so only one batch is held in Arrow
+    memory at a time. ``kwargs`` are passed to ``pyarrow.parquet.ParquetWriter``.
+    Returns the number of rows written.
+    """
+    rows = 0
+    with pq.ParquetWriter(where, SCHEMA, **kwargs) as writer:
+        for batch in iter_record_batches(source, batch_size=row_group_size):
+            writer.write_batch(batch, row_group_size=row_group_size)
+            rows += batch.num_rows
+    return rows
@@ -0,0 +1,280 @@
+"""
+Bulk load parsed feeds into a normalized SQLite database.
+
+Resources are upserted by their atom ``self`` URI, so loading a newer feed of the
+same subscription updates titles and replaces the readings of the interval blocks
+it contains while keeping the blocks it does not::
+
+    loader = SqliteLoader("greenbutton.db")
+    loader.load(parse.parse_feed_stream("feed.xml"))
+
+Reading types have no URI in the object model and are deduplicated by content,
+``reading_type.key`` holds all of it as JSON and a few fields have their own
+column for queries.
+An entry can hold several IntervalBlocks that share its URI, so interval blocks
+are keyed by URI and their position in the entry. Readings are keyed by their
+position in the interval block, as some feeds repeat a start time within a block.
+"""
+
+import json
+import os
+import sqlite3
+from itertools import chain, repeat
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from xsdata.formats.dataclass.serializers import DictEncoder
+
+import greenbutton_objects.objects as ob
+from greenbutton_objects.data import espi
+from greenbutton_objects.export import ExportSource, code, iter_meter_readings, nan_to_none
+from greenbutton_objects.objects.columns import as_seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_point (
+    id INTEGER PRIMARY KEY,
+    uri TEXT NOT NULL UNIQUE,
+    title TEXT,
+    service_kind INTEGER,
+    status INTEGER
+);
+CREATE TABLE IF NOT EXISTS reading_type (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    accumulation_behaviour INTEGER,
+    commodity INTEGER,
+    currency INTEGER,
+    flow_direction INTEGER,
+    interval_length INTEGER,
+    kind INTEGER,
+    power_of_ten_multiplier INTEGER,
+    uom INTEGER
+);
+CREATE TABLE IF NOT EXISTS meter_reading (
+    id INTEGER PRIMARY KEY,
+    uri TEXT NOT NULL UNIQUE,
+    usage_point_id INTEGER NOT NULL REFERENCES usage_point (id),
+    reading_type_id INTEGER REFERENCES reading_type (id),
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS meter_reading_usage_point ON meter_reading (usage_point_id);
+CREATE TABLE IF NOT EXISTS interval_block (
+    id INTEGER PRIMARY KEY,
+    uri TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    meter_reading_id INTEGER NOT NULL REFERENCES meter_reading (id),
+    start INTEGER,
+    duration INTEGER,
+    multiplier REAL,
+    UNIQUE (uri, position)
+);
+CREATE INDEX IF NOT EXISTS interval_block_meter_reading ON interval_block (meter_reading_id);
+CREATE TABLE IF NOT EXISTS interval_reading (
+    interval_block_id INTEGER NOT NULL REFERENCES interval_block (id),
+    position INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    raw_value REAL,
+    value REAL,
+    cost REAL,
+    quality INTEGER,
+    tou INTEGER,
+    cpp INTEGER,
+    consumption_tier INTEGER,
+    PRIMARY KEY (interval_block_id, position)
+) WITHOUT ROWID;
+"""
+
+READING_TYPE_FIELDS = (
+    "accumulation_behaviour",
+    "commodity",
+    "currency",
+    "flow_direction",
+    "interval_length",
+    "kind",
+    "power_of_ten_multiplier",
+    "uom",
+)
+
+UPSERT_USAGE_POINT = """
+INSERT INTO usage_point (uri, title, service_kind, status) VALUES (?, ?, ?, ?)
+ON CONFLICT (uri) DO UPDATE SET
+    title = excluded.title, service_kind = excluded.service_kind, status = excluded.status
+"""
+INSERT_READING_TYPE = (
+    f"INSERT INTO reading_type (key, {', '.join(READING_TYPE_FIELDS)})"
+    f" VALUES (?{', ?' * len(READING_TYPE_FIELDS)}) ON CONFLICT (key) DO NOTHING"
+)
+UPSERT_METER_READING = """
+INSERT INTO meter_reading (uri, usage_point_id, reading_type_id, title) VALUES (?, ?, ?, ?)
+ON CONFLICT (uri) DO UPDATE SET
+    usage_point_id = excluded.usage_point_id,
+    reading_type_id = excluded.reading_type_id,
+    title = excluded.title
+"""
+UPSERT_INTERVAL_BLOCK = """
+INSERT INTO interval_block (uri, position, meter_reading_id, start, duration, multiplier)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (uri, position) DO UPDATE SET
+    meter_reading_id = excluded.meter_reading_id,
+    start = excluded.start,
+    duration = excluded.duration,
+    multiplier = excluded.multiplier
+"""
+INSERT_INTERVAL_READING = "INSERT INTO interval_reading VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+DEFAULT_PRAGMAS: Mapping[str, Union[str, int]] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64 * 1024,  # KiB
+    "foreign_keys": "ON",
+}
+
+ReadingRow = Tuple[Any, ...]
+
+
+def enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+ENCODER = DictEncoder()
+
+
+def reading_type_row(reading_type: espi.ReadingType) -> Tuple[Any, ...]:
+    # The same encoding as ``feed.serialize``, every field tells reading types apart
+    key = json.dumps(ENCODER.encode(reading_type), sort_keys=True)
+    return (key, *(enum_value(getattr(reading_type, name)) for name in READING_TYPE_FIELDS))
+
+
+def block_rows(block_id: int, columns: ob.ReadingColumns) -> Iterator[ReadingRow]:
+    total = len(columns)
+    values: Sequence[Optional[float]] = columns.value
+    if len(values) != total:
+        values = [None] * total
+    return zip(
+        repeat(block_id),
+        range(total),
+        columns.start,
+        columns.duration,
+        columns.raw_value,
+        values,
+        map(nan_to_none, columns.cost),
+        map(code, columns.quality),
+        map(code, columns.tou),
+        columns.cpp,
+        map(code, columns.consumption_tier),
+    )
+
+
+def entry_positions(blocks: Sequence[ob.IntervalBlock]) -> List[Tuple[str, int]]:
+    """``(uri, position)`` of every block, the position counts the blocks of an entry."""
+    positions: Dict[str, int] = {}
+    keys = []
+    for ib in blocks:
+        position = positions[ib.uri] = positions.get(ib.uri, -1) + 1
+        keys.append((ib.uri, position))
+    return keys
+
+
+class SqliteLoader:
+    """Loads feeds into the schema above, creating it when needed.
+
+    Every ``load`` runs in a single transaction and inserts the readings of a meter
+    reading with one ``executemany``. ``pragmas`` are applied to the connection
+    first, the defaults trade durability of the last transactions on power loss
+    for load speed.
+    """
+
+    def __init__(
+        self,
+        database: Union[str, "os.PathLike[str]", sqlite3.Connection],
+        pragmas: Mapping[str, Union[str, int]] = DEFAULT_PRAGMAS,
+    ) -> None:
+        if isinstance(database, sqlite3.Connection):
+            self.connection = database
+        else:
+            self.connection = sqlite3.connect(os.fspath(database))
+        for name, value in pragmas.items():
+            self.connection.execute(f"PRAGMA {name} = {value}")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SqliteLoader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def row_id(self, table: str, column: str, key: str) -> int:
+        row = self.connection.execute(f"SELECT id FROM {table} WHERE {column} = ?", (key,)).fetchone()
+        return int(row[0])
+
+    def load(self, source: ExportSource) -> int:
+        """Upsert the resources of ``source`` and return the number of readings loaded."""
+        connection = self.connection
+        usage_point_ids: Dict[str, int] = {}
+        count = 0
+        with connection:
+            for up, mr in iter_meter_readings(source):
+                usage_point_id = usage_point_ids.get(up.uri)
+                if usage_point_id is None:
+                    connection.execute(
+                        UPSERT_USAGE_POINT, (up.uri, up.title, up.service_kind.value, up.status)
+                    )
+                    usage_point_id = usage_point_ids[up.uri] = self.row_id("usage_point", "uri", up.uri)
+
+                reading_type_id = None
+                if mr.reading_type is not None:
+                    row = reading_type_row(mr.reading_type)
+                    connection.execute(INSERT_READING_TYPE, row)
+                    reading_type_id = self.row_id("reading_type", "key", row[0])
+
+                connection.execute(UPSERT_METER_READING, (mr.uri, usage_point_id, reading_type_id, mr.title))
+                meter_reading_id = self.row_id("meter_reading", "uri", mr.uri)
+
+                blocks = mr.intervalBlock
+                keys = entry_positions(blocks)
+                connection.executemany(
+                    UPSERT_INTERVAL_BLOCK,
+                    [
+                        (
+                            uri,
+                            position,
+                            meter_reading_id,
+                            as_seconds(ib.interval.start) if ib.interval else None,
+                            as_seconds(ib.interval.duration) if ib.interval else None,
+                            ib.multiplier,
+                        )
+                        for (uri, position), ib in zip(keys, blocks)
+                    ],
+                )
+                block_ids = {
+                    (uri, position): id_
+                    for uri, position, id_ in connection.execute(
+                        "SELECT uri, position, id FROM interval_block WHERE meter_reading_id = ?",
+                        (meter_reading_id,),
+                    )
+                }
+                ids = [block_ids[key] for key in keys]
+                # Reloaded blocks replace their readings, blocks of earlier feeds are kept
+                connection.executemany(
+                    "DELETE FROM interval_reading WHERE interval_block_id = ?", [(id_,) for id_ in ids]
+                )
+                connection.executemany(
+                    INSERT_INTERVAL_READING,
+                    chain.from_iterable(block_rows(id_, ib.columns) for id_, ib in zip(ids, blocks)),
+                )
+                count += sum(len(ib.columns) for ib in blocks)
+        return count
+
+
+def load_feed(source: ExportSource, database: Union[str, "os.PathLike[str]", sqlite3.Connection]) -> int:
+    """Load ``source`` into ``database`` with ``SqliteLoader`` and return the number of readings."""
+    loader = SqliteLoader(database)
+    try:
+        return loader.load(source)
+    finally:
+        if not isinstance(database, sqlite3.Connection):
+            loader.close()
@@ -0,0 +1,140 @@
+"""
+Stream interval readings to CSV or newline delimited JSON.
+
+Rows are written a chunk at a time straight from the reading columns, so the
+output is never held in memory. The parsed feed still is, ``parse_feed_stream``
+reads every entry of a feed before it yields the first usage point::
+
+    write_csv(parse.parse_feed_stream("feed.xml"), "readings.csv.gz")
+"""
+
+import csv
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from itertools import islice
+from typing import IO, Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from greenbutton_objects.export import ExportSource, code, iter_meter_readings, nan_to_none
+
+FIELDS = (
+    "usage_point",
+    "meter_reading",
+    "start",
+    "duration",
+    "raw_value",
+    "value",
+    "cost",
+    "quality",
+    "tou",
+    "cpp",
+    "consumption_tier",
+    "uom",
+)
+
+CHUNK_SIZE = 4096
+BUFFER_SIZE = 1 << 20
+
+Row = Tuple[Any, ...]
+Target = Union[str, "os.PathLike[str]", IO[str]]
+
+
+def iso_time(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def iter_rows(source: ExportSource) -> Iterator[Row]:
+    """Yield one tuple of ``FIELDS`` for every interval reading of ``source``.
+
+    ``start`` is an ISO 8601 UTC timestamp, missing values, including NaN, are ``None``.
+    """
+    for up, mr in iter_meter_readings(source):
+        columns = mr.columns
+        total = len(columns)
+        values: Sequence[Optional[float]] = columns.value
+        if len(values) != total:
+            values = [None] * total
+        uom = mr.uom_symbol.strip()
+        for start, duration, raw_value, value, cost, quality, tou, cpp, tier in zip(
+            columns.start,
+            columns.duration,
+            columns.raw_value,
+            values,
+            columns.cost,
+            columns.quality,
+            columns.tou,
+            columns.cpp,
+            columns.consumption_tier,
+        ):
+            yield (
+                up.uri,
+                mr.uri,
+                iso_time(start),
+                duration,
+                nan_to_none(raw_value),
+                nan_to_none(value),
+                nan_to_none(cost),
+                code(quality),
+                code(tou),
+                cpp,
+                code(tier),
+                uom,
+            )
+
+
+def chunks(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def open_target(target: Target, write: Callable[[IO[str]], int]) -> int:
+    """Call ``write`` with ``target``, opening paths with a large buffer and gzip for ``.gz``."""
+    if not isinstance(target, (str, os.PathLike)):
+        return write(target)
+    if os.fspath(target).endswith(".gz"):
+        with gzip.open(target, "wt", compresslevel=6, encoding="utf-8", newline="") as out:
+            return write(out)
+    with open(target, "w", buffering=BUFFER_SIZE, encoding="utf-8", newline="") as out:
+        return write(out)
+
+
+def write_csv(source: ExportSource, target: Target, header: bool = True, chunk_size: int = CHUNK_SIZE) -> int:
+    """Write the interval readings of ``source`` as CSV and return the number of rows.
+
+    ``target`` is a text stream opened with ``newline=""`` or a path, paths ending
+    in ``.gz`` are compressed. Missing values are empty fields.
+    """
+
+    def write(out: IO[str]) -> int:
+        writer = csv.writer(out)
+        if header:
+            writer.writerow(FIELDS)
+        count = 0
+        for chunk in chunks(iter_rows(source), chunk_size):
+            writer.writerows(chunk)
+            count += len(chunk)
+        return count
+
+    return open_target(target, write)
+
+
+def write_ndjson(source: ExportSource, target: Target, chunk_size: int = CHUNK_SIZE) -> int:
+    """Write the interval readings of ``source`` as one JSON object per line.
+
+    ``target`` is a text stream or a path, paths ending in ``.gz`` are compressed.
+    Missing values are ``null``. Returns the number of rows written.
+    """
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def write(out: IO[str]) -> int:
+        count = 0
+        for chunk in chunks(iter_rows(source), chunk_size):
+            out.write("".join([encode(dict(zip(FIELDS, row))) + "\n" for row in chunk]))
+            count += len(chunk)
+        return count
+
+    return open_target(target, write)
@@ -1,113 +1,139 @@
-from typing import Any, List, TypeVar
+import dataclasses
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from typing_extensions import Buffer
 
 import greenbutton_objects.objects as ob
 from greenbutton_objects.atom import EntryForest
+from greenbutton_objects.atom.entry_forest import EntryNode
 from greenbutton_objects.data import espi
-from greenbutton_objects.util import get_first, get_value
+from greenbutton_objects.util import InternPool, get_first
 
 T = TypeVar("T")
 
 
+def resolve_service_kind(up: espi.UsagePoint, reading_types: Iterable[espi.ReadingType]) -> ob.ServiceKind:
+    """Service kind of ``up``, fixing up ``reading_types`` of feeds that have none.
+
+    Shared by ``ObjectFeed`` and ``scan_feed`` so both see the same reading types.
+    """
+    service_category = up.service_category
+    #  Empty elements are bound as empty strings
+    service_kind: Any = service_category.kind if service_category is not None else None
+    if service_kind == "" or service_kind is None:
+        # TODO: We are forcing natural gas here. But we should either use
+        #       hint given to us, apply heuristic rules or throw error
+        for reading_type in reading_types:
+            reading_type.uom = ob.UnitSymbol.THERM.value
+            reading_type.power_of_ten_multiplier = espi.UnitMultiplierKindValue.VALUE_MINUS_3
+        return ob.ServiceKind.GAS
+    return ob.ServiceKind(getattr(service_kind, "value", service_kind))
+
+
 class ObjectFeed:
-    def __init__(self) -> None:
+    """Usage points built from an EntryForest.
+
+    With ``lazy`` set the IntervalReading objects of every block are only created
+    when ``IntervalBlock.readings`` or ``MeterReading.interval_readings`` is first
+    accessed. Consumers that only need metadata or the reading columns skip the
+    per-reading objects entirely.
+
+    Equal ReadingType and LocalTimeParameters objects are shared through ``pool``,
+    pass the same pool to share them between feeds.
+    """
+
+    def __init__(self, lazy: bool = False, pool: Optional[InternPool] = None) -> None:
+        self.lazy = lazy
+        self.pool = pool if pool is not None else InternPool()
         self.usage_points: List[ob.UsagePoint] = []
 
+    def to_bytes(self) -> bytes:
+        """Compact binary form of the feed, see ``feed.serialize``."""
+        from greenbutton_objects.feed import serialize
+
+        return serialize.dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data: Buffer, lazy: bool = False) -> "ObjectFeed":
+        """Load a feed from ``to_bytes`` output or any buffer holding it, e.g. an ``mmap``."""
+        from greenbutton_objects.feed import serialize
+
+        return serialize.loads(data, lazy=lazy)
+
     def build(self, entry_forest: EntryForest) -> "ObjectFeed":
-        usage_points = EntryForest.get_elements_by_type(espi.UsagePoint, entry_forest.roots)
+        for usage_point in self.iter_usage_points(entry_forest):
+            self.usage_points.append(usage_point)
+        return self
 
+    def iter_usage_points(self, entry_forest: EntryForest) -> Iterator[ob.UsagePoint]:
+        usage_points = entry_forest.get_root_elements_by_type(espi.UsagePoint)
         for up_node in usage_points:
-            # TODO: We are assuming that there is only one UsagePoint object
-            #       within the usage point node
-            up = up_node.first_content()
-
-            local_time_params = up_node.safe_get_content(espi.LocalTimeParameters)
-            electric_power_usage_summary = up_node.safe_get_content(espi.ElectricPowerUsageSummary)
-
-            meter_readings: List[ob.MeterReading] = []
-            for mr_node in up_node.get_related_of_type(espi.MeterReading):
-                reading_type: espi.ReadingType | None = mr_node.safe_get_content(espi.ReadingType)
-
-                interval_block_nodes = mr_node.get_related_of_type(espi.IntervalBlock)
-                interval_blocks: List[ob.IntervalBlock] = []
-
-                combined_readings: List[ob.IntervalReading] = []
-                for interval_block_node in interval_block_nodes:
-                    interval_block_content = get_first(interval_block_node.content)
-
-                    for interval_block in interval_block_content.content:  # type: ignore
-                        block = ob.IntervalBlock(
-                            uri=interval_block_node.uri, interval=interval_block.interval
-                        )
-
-                        self.process_readings(block, interval_block)
-                        interval_blocks.append(block)
-                        combined_readings.extend(block.readings)
-
-                reading = ob.MeterReading(
-                    title=mr_node.title,
-                    uri=mr_node.uri,
-                    reading_type=reading_type if reading_type else espi.ReadingType(),
-                    intervalBlock=tuple(interval_blocks),
-                    interval_readings=tuple(combined_readings),
-                )
-
-                for ib in reading.intervalBlock:
-                    ib.compute_multiplier(reading.reading_type)
-                reading.patch()
-
-                meter_readings.append(reading)
-
-            service_kind = up.service_category.kind
-            if service_kind == "" or service_kind is None:
-                # TODO: We are forcing natural gas here. But we should either use
-                #       hint given to us, apply heuristic rules or throw error
-                service_kind = ob.ServiceKind.GAS
-                for mr in meter_readings:
-                    mr.reading_type.uom = ob.UnitSymbol.THERM.value
-                    mr.reading_type.power_of_ten_multiplier = espi.UnitMultiplierKindValue.VALUE_MINUS_3
-                    for ib in mr.intervalBlock:
-                        ib.compute_multiplier(mr.reading_type)
-
-            else:
-                service_kind = ob.ServiceKind(service_kind.value)
-
-            self.usage_points.append(
-                ob.UsagePoint(
-                    title=up_node.title,
-                    service_kind=service_kind,
-                    local_time_parameters=local_time_params,
-                    electric_power_usage_summary=electric_power_usage_summary,
-                    meter_readings=tuple(meter_readings),
-                    uri=up_node.uri,
-                )
+            yield self.build_usage_point(up_node)
+
+    def build_usage_point(self, up_node: EntryNode) -> ob.UsagePoint:
+        # TODO: We are assuming that there is only one UsagePoint object
+        #       within the usage point node
+        up = up_node.first_content()
+
+        local_time_params = up_node.safe_get_content(espi.LocalTimeParameters)
+        electric_power_usage_summary = up_node.safe_get_content(espi.ElectricPowerUsageSummary)
+
+        meter_readings: List[ob.MeterReading] = []
+        for mr_node in up_node.get_related_of_type(espi.MeterReading):
+            reading_type: espi.ReadingType | None = mr_node.safe_get_content(espi.ReadingType)
+
+            interval_block_nodes = mr_node.get_related_of_type(espi.IntervalBlock)
+            interval_blocks: List[ob.IntervalBlock] = []
+            for interval_block_node in interval_block_nodes:
+                interval_blocks.extend(self.get_interval_blocks(interval_block_node))
+
+            reading = ob.MeterReading(
+                title=mr_node.title,
+                uri=mr_node.uri,
+                reading_type=reading_type if reading_type else espi.ReadingType(),
+                intervalBlock=tuple(interval_blocks),
             )
 
-        return self
+            meter_readings.append(reading)
+
+        service_kind = resolve_service_kind(up, [mr.reading_type for mr in meter_readings])
+        for mr in meter_readings:
+            # Shared with equal reading types, so only pooled once fixed up above
+            mr.reading_type = self.pool.content(mr.reading_type)
+            mr.compute_multipliers()
+            if not self.lazy:
+                mr.patch()
+
+        return ob.UsagePoint(
+            title=up_node.title,
+            service_kind=service_kind,
+            local_time_parameters=self.pool.content(local_time_params) if local_time_params else None,
+            electric_power_usage_summary=electric_power_usage_summary,
+            meter_readings=tuple(meter_readings),
+            uri=up_node.uri,
+        )
+
+    def get_interval_blocks(self, interval_block_node: EntryNode) -> List[ob.IntervalBlock]:
+        return self.convert_interval_blocks(
+            interval_block_node.uri, interval_block_node.content, interval_block_node.interval_columns
+        )
+
+    def convert_interval_blocks(
+        self, uri: str, content: Sequence[Any], columns: Optional[Sequence[ob.ReadingColumns]] = None
+    ) -> List[ob.IntervalBlock]:
+        blocks = []
+        interval_block_content = get_first(content)
+        for i, interval_block in enumerate(interval_block_content.content):  # type: ignore
+            block = ob.IntervalBlock(uri=uri, interval=interval_block.interval)
+            if columns is None:
+                self.process_readings(block, interval_block)
+            else:
+                # Every build scales its own copy, the decoded arrays are shared
+                block.columns = dataclasses.replace(columns[i])
+            blocks.append(block)
+        return blocks
 
     def process_readings(self, block: ob.IntervalBlock, interval_block: espi.IntervalBlock) -> None:
         # TODO: If quality of reading is not in readings it might be in the
         #       top level description
-        readings = []
-        for interval_reading in interval_block.interval_reading:
-            reading_values = self.filter_allowed(interval_reading)
-            if interval_reading.reading_quality:
-                quality = interval_reading.reading_quality[0].quality
-                quality_of_reading = get_value(
-                    quality,
-                    missing_val=ob.QualityOfReading.MISSING,
-                    src_type=espi.QualityOfReadingValue,
-                    dest_type=ob.QualityOfReading,
-                )
-                reading_values["quality_of_reading"] = quality_of_reading
-            reading_values["raw_value"] = interval_reading.value
-            readings.append(ob.IntervalReading(**reading_values, parent=block))
-        block.readings = readings
-
-    allowed_reading_keys = ("consumption_tier", "cost", "cpp", "time_period", "tou")
-
-    def filter_allowed(self, interval_reading: espi.IntervalReading) -> dict[str, Any]:
-        reading_values = {}
-        for k, v in interval_reading.__dict__.items():
-            if k in self.allowed_reading_keys and v is not None:
-                reading_values[k] = v
-        return reading_values
+        block.columns = ob.ReadingColumns.from_espi(interval_block.interval_reading)
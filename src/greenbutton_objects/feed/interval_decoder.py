@@ -0,0 +1,165 @@
+from decimal import Decimal
+from typing import IO, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+from greenbutton_objects.atom.entry_reader import EntryReader
+from greenbutton_objects.data.atom import EntryType
+from greenbutton_objects.objects import QualityOfReading, ReadingColumns
+from greenbutton_objects.objects.columns import MISSING_CODE, quality_code
+
+ESPI_NAMESPACE = "{http://naesb.org/espi}"
+ATOM_CONTENT_TAG = "{http://www.w3.org/2005/Atom}content"
+
+INTERVAL_BLOCK_TAG = ESPI_NAMESPACE + "IntervalBlock"
+INTERVAL_READING_TAG = ESPI_NAMESPACE + "IntervalReading"
+TIME_PERIOD_TAG = ESPI_NAMESPACE + "timePeriod"
+START_TAG = ESPI_NAMESPACE + "start"
+DURATION_TAG = ESPI_NAMESPACE + "duration"
+VALUE_TAG = ESPI_NAMESPACE + "value"
+COST_TAG = ESPI_NAMESPACE + "cost"
+READING_QUALITY_TAG = ESPI_NAMESPACE + "ReadingQuality"
+QUALITY_TAG = ESPI_NAMESPACE + "quality"
+TOU_TAG = ESPI_NAMESPACE + "tou"
+CPP_TAG = ESPI_NAMESPACE + "cpp"
+CONSUMPTION_TIER_TAG = ESPI_NAMESPACE + "consumptionTier"
+
+
+def text_to_seconds(text: Optional[str]) -> int:
+    if not text:
+        return 0
+    try:
+        return int(text)
+    except ValueError:
+        #  Some providers send fractional timestamps, e.g. "1721154384.66136"
+        return int(Decimal(text))
+
+
+def text_to_float(text: Optional[str]) -> float:
+    if not text:
+        return float("NaN")
+    return float(text)
+
+
+def text_to_code(text: Optional[str], missing: int = MISSING_CODE) -> int:
+    #  Empty or malformed codes are missing, as in ReadingColumns.from_espi
+    if not text:
+        return missing
+    try:
+        return int(text)
+    except ValueError:
+        return missing
+
+
+def text_to_quality(text: Optional[str]) -> int:
+    quality = text_to_code(text)
+    if quality == MISSING_CODE:
+        return QualityOfReading.MISSING.value
+    return quality_code(quality)
+
+
+def decode_interval_block(element: ElementTree.Element) -> ReadingColumns:
+    """Decode the IntervalReading children of an ``espi:IntervalBlock`` element.
+
+    This produces the same columns as ``ReadingColumns.from_espi`` without binding
+    every reading into xsdata dataclasses first.
+    """
+    columns = ReadingColumns()
+    start = columns.start.append
+    duration = columns.duration.append
+    raw_value = columns.raw_value.append
+    cost = columns.cost.append
+    quality = columns.quality.append
+    tou = columns.tou.append
+    cpp = columns.cpp.append
+    consumption_tier = columns.consumption_tier.append
+
+    nan = float("NaN")
+    missing_quality = QualityOfReading.MISSING.value
+    for reading in element.iterfind(INTERVAL_READING_TAG):
+        reading_start = 0
+        reading_duration = 0
+        reading_value = nan
+        reading_cost = nan
+        reading_quality: Optional[int] = None
+        reading_tou = MISSING_CODE
+        reading_cpp = 0
+        reading_tier = MISSING_CODE
+
+        for child in reading:
+            tag = child.tag
+            if tag == TIME_PERIOD_TAG:
+                for part in child:
+                    if part.tag == START_TAG:
+                        reading_start = text_to_seconds(part.text)
+                    elif part.tag == DURATION_TAG:
+                        reading_duration = text_to_seconds(part.text)
+            elif tag == VALUE_TAG:
+                reading_value = text_to_float(child.text)
+            elif tag == COST_TAG:
+                reading_cost = text_to_float(child.text)
+            elif tag == READING_QUALITY_TAG:
+                if reading_quality is None:
+                    reading_quality = text_to_quality(child.findtext(QUALITY_TAG))
+            elif tag == TOU_TAG:
+                reading_tou = text_to_code(child.text)
+            elif tag == CPP_TAG:
+                reading_cpp = text_to_code(child.text, 0)
+            elif tag == CONSUMPTION_TIER_TAG:
+                reading_tier = text_to_code(child.text)
+
+        start(reading_start)
+        duration(reading_duration)
+        raw_value(reading_value)
+        cost(reading_cost)
+        quality(missing_quality if reading_quality is None else reading_quality)
+        tou(reading_tou)
+        cpp(reading_cpp)
+        consumption_tier(reading_tier)
+
+    return columns
+
+
+class IntervalBlockReader(EntryReader):
+    """Entry reader that decodes IntervalBlock readings with ``decode_interval_block``.
+
+    The rest of every entry, including the ``interval`` of each IntervalBlock, is
+    still bound by xsdata.
+    """
+
+    def read_decoded(
+        self, source: Union[str, IO[bytes]]
+    ) -> Iterator[Tuple[EntryType, Optional[List[ReadingColumns]]]]:
+        for element in self.iter_elements(source):
+            interval_columns = None
+            content = element.find(ATOM_CONTENT_TAG)
+            if content is not None:
+                interval_blocks = content.findall(INTERVAL_BLOCK_TAG)
+                if interval_blocks:
+                    interval_columns = []
+                    for interval_block in interval_blocks:
+                        interval_columns.append(decode_interval_block(interval_block))
+                        strip_readings(interval_block)
+            yield self.bind(element), interval_columns
+
+    def read_headers(self, source: Union[str, IO[bytes]]) -> Iterator[Tuple[EntryType, Optional[List[int]]]]:
+        """Like ``read_decoded``, but only count the readings of every IntervalBlock.
+
+        The readings are dropped before binding, so IntervalBlocks keep just their
+        ``interval``.
+        """
+        for element in self.iter_elements(source):
+            reading_counts = None
+            content = element.find(ATOM_CONTENT_TAG)
+            if content is not None:
+                interval_blocks = content.findall(INTERVAL_BLOCK_TAG)
+                if interval_blocks:
+                    reading_counts = [strip_readings(interval_block) for interval_block in interval_blocks]
+            yield self.bind(element), reading_counts
+
+
+def strip_readings(interval_block: ElementTree.Element) -> int:
+    """Remove the IntervalReading children of ``interval_block`` and return their number."""
+    children = [child for child in interval_block if child.tag != INTERVAL_READING_TAG]
+    count = len(interval_block) - len(children)
+    interval_block[:] = children
+    return count
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import greenbutton_objects.objects as ob
+from greenbutton_objects.atom import EntryForest
+from greenbutton_objects.atom.entry_forest import EntryNode
+from greenbutton_objects.data import espi
+from greenbutton_objects.feed.feed import resolve_service_kind
+from greenbutton_objects.objects.columns import as_seconds
+from greenbutton_objects.util import get_first
+
+
+@dataclass
+class MeterReadingSummary:
+    """
+    :ivar title: The title of the meter reading
+    :ivar uri: The URI that identifies this meter reading in the atom feed
+    :ivar reading_type: The ReadingType of the readings, as ``parse_feed`` builds it
+    :ivar interval_blocks: Number of interval blocks
+    :ivar readings: Number of interval readings
+    :ivar start: Start of the earliest interval block in epoch seconds
+    :ivar end: End of the latest interval block in epoch seconds
+    """
+
+    title: str
+    uri: str
+    reading_type: espi.ReadingType
+    interval_blocks: int
+    readings: int
+    start: Optional[int] = None
+    end: Optional[int] = None
+
+
+@dataclass
+class UsagePointSummary:
+    """
+    :ivar title: The title of the usage point
+    :ivar uri: The URI that identifies this usage point in the atom feed
+    :ivar service_kind: Type of service (Electricity, Natural Gas, etc.)
+    :ivar meter_readings: Summaries of the meter readings
+    :ivar local_time_parameters: Timestamp adjustment rules
+    """
+
+    title: str
+    uri: str
+    service_kind: ob.ServiceKind
+    meter_readings: Tuple[MeterReadingSummary, ...]
+    local_time_parameters: Optional[espi.TimeConfiguration] = None
+
+
+@dataclass
+class FeedSummary:
+    """What a feed contains, read without decoding its interval readings, see ``scan_feed``."""
+
+    usage_points: List[UsagePointSummary]
+
+    @property
+    def readings(self) -> int:
+        return sum(mr.readings for up in self.usage_points for mr in up.meter_readings)
+
+    @property
+    def start(self) -> Optional[int]:
+        starts = [mr.start for up in self.usage_points for mr in up.meter_readings if mr.start is not None]
+        return min(starts) if starts else None
+
+    @property
+    def end(self) -> Optional[int]:
+        ends = [mr.end for up in self.usage_points for mr in up.meter_readings if mr.end is not None]
+        return max(ends) if ends else None
+
+
+def summarize(entry_forest: EntryForest, reading_counts: Dict[str, List[int]]) -> FeedSummary:
+    """Summarize the usage points of ``entry_forest``.
+
+    ``reading_counts`` holds the number of readings of every IntervalBlock in an
+    entry, by entry URI.
+    """
+    usage_points = [
+        summarize_usage_point(up_node, reading_counts)
+        for up_node in entry_forest.get_root_elements_by_type(espi.UsagePoint)
+    ]
+    return FeedSummary(usage_points=usage_points)
+
+
+def summarize_usage_point(up_node: EntryNode, reading_counts: Dict[str, List[int]]) -> UsagePointSummary:
+    up = up_node.first_content()
+    meter_readings = tuple(
+        summarize_meter_reading(mr_node, reading_counts)
+        for mr_node in up_node.get_related_of_type(espi.MeterReading)
+    )
+    kind = resolve_service_kind(up, [mr.reading_type for mr in meter_readings])
+
+    local_time_params = up_node.safe_get_content(espi.LocalTimeParameters)
+    return UsagePointSummary(
+        title=up_node.title,
+        uri=up_node.uri,
+        service_kind=kind,
+        meter_readings=meter_readings,
+        local_time_parameters=local_time_params,
+    )
+
+
+def summarize_meter_reading(mr_node: EntryNode, reading_counts: Dict[str, List[int]]) -> MeterReadingSummary:
+    interval_blocks = 0
+    readings = 0
+    start: Optional[int] = None
+    end: Optional[int] = None
+    for ib_node in mr_node.get_related_of_type(espi.IntervalBlock):
+        counts = reading_counts.get(ib_node.uri, [])
+        readings += sum(counts)
+        content = get_first(ib_node.content)
+        blocks: Sequence[espi.IntervalBlock] = content.content if content is not None else []  # type: ignore
+        for interval_block in blocks:
+            interval_blocks += 1
+            interval = interval_block.interval
+            if interval is None:
+                continue
+            block_start = as_seconds(interval.start)
+            block_end = block_start + as_seconds(interval.duration)
+            start = block_start if start is None else min(start, block_start)
+            end = block_end if end is None else max(end, block_end)
+
+    reading_type: Optional[espi.ReadingType] = mr_node.safe_get_content(espi.ReadingType)
+    return MeterReadingSummary(
+        title=mr_node.title,
+        uri=mr_node.uri,
+        reading_type=reading_type if reading_type else espi.ReadingType(),
+        interval_blocks=interval_blocks,
+        readings=readings,
+        start=start,
+        end=end,
+    )
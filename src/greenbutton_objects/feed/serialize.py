@@ -0,0 +1,196 @@
+"""
+Compact binary form of an ObjectFeed.
+
+The layout is a fixed header, a JSON metadata block describing the usage points,
+meter readings and interval blocks, followed by the raw bytes of every
+``ReadingColumns`` column, each aligned to 8 bytes. ESPI objects in the metadata
+are encoded with xsdata's dict encoder, so loading never unpickles arbitrary
+objects. They are stored once per distinct content and decoded for every
+reference, so loaded meter readings never share a mutable ReadingType.
+
+Columns are read straight out of any buffer, so a file can be memory-mapped with
+``load`` and only the column bytes are copied into their arrays.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import fields
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from typing_extensions import Buffer
+from xsdata.formats.dataclass.parsers import DictDecoder
+from xsdata.formats.dataclass.serializers import DictEncoder
+
+import greenbutton_objects.objects as ob
+from greenbutton_objects.data import espi
+from greenbutton_objects.feed.feed import ObjectFeed
+from greenbutton_objects.parse import get_xml_context
+
+MAGIC = b"GBOF"
+FORMAT_VERSION = 2
+# magic, format version, big endian flag, metadata length
+HEADER = struct.Struct("<4sHBxQ")
+ALIGNMENT = 8
+
+COLUMN_NAMES = tuple(column.name for column in fields(ob.ReadingColumns))
+
+
+class SerializationError(ValueError):
+    pass
+
+
+def padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def dumps(feed: ObjectFeed) -> bytes:
+    encoder = DictEncoder()
+    objects: List[List[str]] = []
+    object_index: Dict[Tuple[str, str], int] = {}
+
+    def encode(obj: Optional[object]) -> Optional[int]:
+        if obj is None:
+            return None
+        key = (type(obj).__name__, json.dumps(encoder.encode(obj), sort_keys=True))
+        index = object_index.get(key)
+        if index is None:
+            index = object_index[key] = len(objects)
+            objects.append(list(key))
+        return index
+
+    buffers: List[bytes] = []
+    usage_points = []
+    for up in feed.usage_points:
+        meter_readings = []
+        for mr in up.meter_readings:
+            blocks = []
+            for ib in mr.intervalBlock:
+                block = {
+                    "uri": ib.uri,
+                    "interval": [ib.interval.start, ib.interval.duration] if ib.interval else None,
+                    "multiplier": ib.multiplier,
+                    "reading_power_of_ten": ib.reading_power_of_ten,
+                    "length": len(ib.columns),
+                    "scaled": len(ib.columns.value) == len(ib.columns),
+                }
+                blocks.append(block)
+                for name in COLUMN_NAMES:
+                    data = getattr(ib.columns, name).tobytes()
+                    buffers.append(data + bytes(padding(len(data))))
+            meter_reading = {
+                "title": mr.title,
+                "uri": mr.uri,
+                "reading_type": encode(mr.reading_type),
+                "blocks": blocks,
+            }
+            meter_readings.append(meter_reading)
+        usage_point = {
+            "title": up.title,
+            "uri": up.uri,
+            "service_kind": up.service_kind.value,
+            "status": up.status,
+            "local_time_parameters": encode(up.local_time_parameters),
+            "electric_power_usage_summary": encode(up.electric_power_usage_summary),
+            "meter_readings": meter_readings,
+        }
+        usage_points.append(usage_point)
+
+    metadata = json.dumps({"objects": objects, "usage_points": usage_points}, separators=(",", ":")).encode()
+    metadata += b" " * padding(HEADER.size + len(metadata))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder == "big", len(metadata))
+    return b"".join([header, metadata, *buffers])
+
+
+def loads(data: Buffer, lazy: bool = False) -> ObjectFeed:
+    """Load a feed from ``bytes`` or any other buffer, e.g. an ``mmap``."""
+    view = memoryview(data).cast("B")
+    if len(view) < HEADER.size:
+        raise SerializationError("Not a serialized ObjectFeed")
+    magic, version, big_endian, metadata_size = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SerializationError("Not a serialized ObjectFeed")
+    if version != FORMAT_VERSION:
+        raise SerializationError(f"Unsupported ObjectFeed format version {version}")
+    swap_bytes = bool(big_endian) != (sys.byteorder == "big")
+
+    offset = HEADER.size + metadata_size
+    metadata = json.loads(bytes(view[HEADER.size : offset]))
+
+    decoder = DictDecoder(context=get_xml_context())
+    objects = [(getattr(espi, type_name), json.loads(data)) for type_name, data in metadata["objects"]]
+
+    def decode(index: Optional[int]) -> Any:
+        if index is None:
+            return None
+        espi_type, data = objects[index]
+        return decoder.decode(data, espi_type)
+
+    def decode_interval(value: Optional[List[Any]]) -> Any:
+        if value is None:
+            return None
+        return espi.DateTimeInterval(start=value[0], duration=value[1])
+
+    def read_columns(length: int, scaled: bool) -> ob.ReadingColumns:
+        nonlocal offset
+        columns = ob.ReadingColumns()
+        for name in COLUMN_NAMES:
+            column: array[Any] = getattr(columns, name)
+            size = column.itemsize * (length if scaled or name != "value" else 0)
+            if offset + size > len(view):
+                raise SerializationError("Truncated ObjectFeed")
+            column.frombytes(view[offset : offset + size])
+            if swap_bytes:
+                column.byteswap()
+            offset += size + padding(size)
+        return columns
+
+    feed = ObjectFeed(lazy=lazy)
+    for up in metadata["usage_points"]:
+        meter_readings = []
+        for mr in up["meter_readings"]:
+            reading_type = decode(mr["reading_type"])
+            blocks = []
+            for ib in mr["blocks"]:
+                columns = read_columns(ib["length"], ib["scaled"])
+                blocks.append(
+                    ob.IntervalBlock(
+                        uri=ib["uri"],
+                        interval=decode_interval(ib["interval"]),
+                        multiplier=ib["multiplier"],
+                        reading_power_of_ten=ib["reading_power_of_ten"],
+                        columns=columns,
+                        reading_type=reading_type,
+                    )
+                )
+            meter_reading = ob.MeterReading(
+                title=mr["title"], uri=mr["uri"], reading_type=reading_type, intervalBlock=tuple(blocks)
+            )
+            if not lazy:
+                meter_reading.patch()
+            meter_readings.append(meter_reading)
+
+        feed.usage_points.append(
+            ob.UsagePoint(
+                title=up["title"],
+                uri=up["uri"],
+                meter_readings=tuple(meter_readings),
+                service_kind=ob.ServiceKind(up["service_kind"]),
+                electric_power_usage_summary=decode(up["electric_power_usage_summary"]),
+                local_time_parameters=decode(up["local_time_parameters"]),
+                status=up["status"],
+            )
+        )
+    return feed
+
+
+def load(path: Union[str, "os.PathLike[str]"], lazy: bool = False) -> ObjectFeed:
+    """Load a feed written with ``dumps`` by memory-mapping ``path``."""
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            raise SerializationError("Not a serialized ObjectFeed")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped, lazy=lazy)
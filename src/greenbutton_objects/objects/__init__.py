@@ -1,4 +1,7 @@
+from .columns import ReadingColumns
+from .compact import CompactDateTimeInterval, CompactIntervalBlock, CompactIntervalReading
 from .enums import (
+    QUALITY_OF_READING_BY_VALUE,
     QUALITY_OF_READING_DESCRIPTIONS,
     SERVICE_KIND_DESCRIPTIONS,
     UNIT_SYMBOL_DESCRIPTIONS,
@@ -6,7 +9,9 @@ from .enums import (
     ServiceKind,
     UnitSymbol,
 )
+from .local_time import DstRule, LocalTimeRules
 from .objects import IntervalBlock, IntervalReading, MeterReading, UsagePoint
+from .resample import Buckets
 
 __all__ = [
     "UsagePoint",
@@ -16,7 +21,15 @@ __all__ = [
     "IntervalBlock",
     "MeterReading",
     "IntervalReading",
+    "ReadingColumns",
+    "CompactIntervalBlock",
+    "CompactIntervalReading",
+    "CompactDateTimeInterval",
+    "Buckets",
+    "DstRule",
+    "LocalTimeRules",
     "UNIT_SYMBOL_DESCRIPTIONS",
     "SERVICE_KIND_DESCRIPTIONS",
     "QUALITY_OF_READING_DESCRIPTIONS",
+    "QUALITY_OF_READING_BY_VALUE",
 ]
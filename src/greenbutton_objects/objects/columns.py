@@ -0,0 +1,137 @@
+import calendar
+import warnings
+from array import array
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import repeat
+from operator import mul
+from typing import Any, Iterable, Optional, Sequence
+
+import greenbutton_objects.data.espi as espi
+from greenbutton_objects.objects.enums import QUALITY_OF_READING_BY_VALUE, QualityOfReading
+
+MISSING_CODE = -1
+
+
+def as_seconds(value: object) -> int:
+    #  Some providers produce feeds that are not compatible with the XSD schema,
+    #  xsdata leaves such values as strings, e.g. "1721154384.66136"
+    if type(value) is int:
+        return value
+    if type(value) is str:
+        return int(Decimal(value))
+    if isinstance(value, datetime):
+        #  Naive datetimes are UTC, like the ones IntervalReading.start returns
+        return calendar.timegm(value.utctimetuple())
+    if isinstance(value, timedelta):
+        return int(value.total_seconds())
+    return 0
+
+
+def quality_code(value: int) -> int:
+    """``value`` if it is a QualityOfReading value, warn and return MISSING otherwise."""
+    if value in QUALITY_OF_READING_BY_VALUE:
+        return value
+    warnings.warn(f"Unknown quality of reading {value}, treated as missing", stacklevel=2)
+    return QualityOfReading.MISSING.value
+
+
+def optional_code(value: object, missing: int = MISSING_CODE) -> int:
+    #  Empty elements, e.g. <tou/>, are bound as empty strings
+    return value if type(value) is int else missing
+
+
+@dataclass
+class ReadingColumns:
+    """Interval readings of one or more IntervalBlocks stored column by column.
+
+    Every column is an ``array.array`` of the same length, so a column can be handed
+    to other libraries without copying (e.g. ``numpy.frombuffer(columns.value)``).
+
+    :ivar start: Start of the reading in epoch seconds
+    :ivar duration: Duration of the reading in seconds
+    :ivar raw_value: Value in units specified by ReadingType (not scaled)
+    :ivar cost: Cost in hundred-thousandths of the currency, NaN when missing
+    :ivar quality: QualityOfReading value, -1 when missing
+    :ivar tou: TOU code, -1 when missing
+    :ivar cpp: Critical peak period bucket, 0 means not applicable
+    :ivar consumption_tier: Consumption tier code, -1 when missing
+    :ivar value: raw_value scaled by the IntervalBlock multiplier,
+        empty until ``scale`` is called
+    """
+
+    start: "array[int]" = field(default_factory=lambda: array("q"))
+    duration: "array[int]" = field(default_factory=lambda: array("i"))
+    raw_value: "array[float]" = field(default_factory=lambda: array("d"))
+    cost: "array[float]" = field(default_factory=lambda: array("d"))
+    quality: "array[int]" = field(default_factory=lambda: array("b"))
+    tou: "array[int]" = field(default_factory=lambda: array("q"))
+    cpp: "array[int]" = field(default_factory=lambda: array("q"))
+    consumption_tier: "array[int]" = field(default_factory=lambda: array("q"))
+    value: "array[float]" = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @classmethod
+    def from_espi(cls, interval_readings: Sequence[espi.IntervalReading]) -> "ReadingColumns":
+        columns = cls()
+        nan = float("NaN")
+        for interval_reading in interval_readings:
+            time_period = interval_reading.time_period
+            if time_period is None:
+                columns.start.append(0)
+                columns.duration.append(0)
+            else:
+                columns.start.append(as_seconds(time_period.start))
+                columns.duration.append(as_seconds(time_period.duration))
+
+            raw_value = interval_reading.value
+            columns.raw_value.append(float(raw_value) if raw_value is not None else nan)
+
+            cost = interval_reading.cost
+            columns.cost.append(float(cost) if cost is not None else nan)
+
+            quality = QualityOfReading.MISSING.value
+            if interval_reading.reading_quality:
+                reading_quality = interval_reading.reading_quality[0].quality
+                if isinstance(reading_quality, espi.QualityOfReadingValue):
+                    quality = reading_quality.value
+                elif type(reading_quality) is int:
+                    quality = quality_code(reading_quality)
+            columns.quality.append(quality)
+
+            columns.tou.append(optional_code(interval_reading.tou))
+            columns.cpp.append(optional_code(interval_reading.cpp, 0))
+            columns.consumption_tier.append(optional_code(interval_reading.consumption_tier))
+        return columns
+
+    @classmethod
+    def from_readings(cls, readings: Iterable[Any]) -> "ReadingColumns":
+        """Columns of ``IntervalReading`` objects, ``value`` is left unscaled."""
+        columns = cls()
+        for reading in readings:
+            columns.start.append(reading.start_epoch)
+            columns.duration.append(reading.end_epoch - reading.start_epoch)
+            columns.raw_value.append(reading.raw_value)
+            columns.cost.append(reading.cost)
+            columns.quality.append(reading.quality_of_reading.value)
+            columns.tou.append(optional_code(reading.tou))
+            columns.cpp.append(optional_code(reading.cpp, 0))
+            columns.consumption_tier.append(optional_code(reading.consumption_tier))
+        return columns
+
+    @classmethod
+    def concat(cls, parts: Iterable["ReadingColumns"]) -> "ReadingColumns":
+        columns = cls()
+        for part in parts:
+            for column in fields(cls):
+                getattr(columns, column.name).extend(getattr(part, column.name))
+        return columns
+
+    def scale(self, multiplier: Optional[float]) -> None:
+        if multiplier is None:
+            self.value = array("d")
+        else:
+            self.value = array("d", map(mul, self.raw_value, repeat(multiplier)))
@@ -80,6 +80,8 @@ class QualityOfReading(Enum):
     MISSING = -1
 
 
+QUALITY_OF_READING_BY_VALUE = {quality.value: quality for quality in QualityOfReading}
+
 QUALITY_OF_READING_DESCRIPTIONS = {
     QualityOfReading.VALIDATED.value: "data that has gone through all required validation checks "
     "and either passed them all or has been verified",
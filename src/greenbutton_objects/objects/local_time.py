@@ -0,0 +1,252 @@
+import calendar
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from itertools import islice, repeat
+from operator import add, floordiv, le
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from typing_extensions import override
+
+import greenbutton_objects.data.espi as espi
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY = 86400
+
+# Rules that feeds send when the time zone has no DST
+NO_DST_RULES = frozenset((0x00000000, 0xFFFFFFFF))
+
+
+def rule_to_int(rule: Union[bytes, str, int]) -> int:
+    if isinstance(rule, bytes):
+        return int.from_bytes(rule, "big")
+    if isinstance(rule, str):
+        return int(rule, 16)
+    return rule
+
+
+@dataclass(frozen=True)
+class DstRule:
+    """Decoded ESPI ``DstRuleType``, the date and time a DST transition happens.
+
+    The rule is a 32 bit value: bits 0-11 are seconds, 12-16 hours, 17-19 the day
+    of the week (1 is Monday, 0 not applicable), 20-24 the day of the month (0 not
+    applicable), 25-27 the operator and 28-31 the month. The operator selects the
+    day of the transition:
+
+    - 0: the day of the month
+    - 1: the day of the week on or after the day of the month
+    - 2 to 5: the first to fourth occurrence of the day of the week in the month
+    - 6: the last occurrence of the day of the week in the month
+    - 7: the day of the week on or before the day of the month
+
+    A day of the month of 0 stands for the first day of the month with operators 0
+    and 1 and for the last with operator 7. E.g. ``360E2000`` is the second Sunday
+    of March at 2:00 and ``B40E2000`` the first Sunday of November at 2:00.
+    """
+
+    month: int
+    operator: int
+    day_of_month: int
+    day_of_week: int
+    hour: int
+    seconds: int
+
+    @classmethod
+    def decode(cls, rule: Union[bytes, str, int]) -> "DstRule":
+        rule = rule_to_int(rule)
+        decoded = cls(
+            month=rule >> 28 & 0xF,
+            operator=rule >> 25 & 0x7,
+            day_of_month=rule >> 20 & 0x1F,
+            day_of_week=rule >> 17 & 0x7,
+            hour=rule >> 12 & 0x1F,
+            seconds=rule & 0xFFF,
+        )
+        if not 1 <= decoded.month <= 12:
+            raise ValueError(f"Invalid DST rule {rule:08X}: month {decoded.month}")
+        if decoded.operator != 0 and decoded.day_of_week == 0:
+            raise ValueError(f"Invalid DST rule {rule:08X}: operator {decoded.operator} needs a day of week")
+        return decoded
+
+    def day(self, year: int) -> date:
+        month_days = calendar.monthrange(year, self.month)[1]
+        operator = self.operator
+        if operator == 0:
+            return date(year, self.month, self.day_of_month or 1)
+
+        if operator <= 5:
+            # Operator 1 counts from the day of the month, the others from the 1st
+            first = (self.day_of_month or 1) if operator == 1 else 1
+            day = date(year, self.month, first)
+            day += timedelta(days=(self.day_of_week - day.isoweekday()) % 7)
+            day += timedelta(weeks=max(operator - 2, 0))
+        else:
+            # Operator 6 counts back from the end of the month, 7 from the day of the month
+            last = (self.day_of_month or month_days) if operator == 7 else month_days
+            day = date(year, self.month, last)
+            day -= timedelta(days=(day.isoweekday() - self.day_of_week) % 7)
+
+        if day.month != self.month or day.year != year:
+            raise ValueError(f"DST rule {self} has no day in {year}")
+        return day
+
+    def local_seconds(self, year: int) -> int:
+        """Wall clock time of the transition in ``year`` as seconds since the epoch."""
+        return (self.day(year).toordinal() - EPOCH_ORDINAL) * DAY + self.hour * 3600 + self.seconds
+
+
+class LocalTimeRules:
+    """Compiled ``TimeConfiguration`` that converts UTC epoch seconds to local time.
+
+    DST starts at the start rule's wall clock time in standard time and ends at the
+    end rule's wall clock time in daylight time, as in North America. Transitions
+    are computed once per year and cached, and whole arrays of timestamps are
+    converted a run of equal offsets at a time.
+    """
+
+    def __init__(
+        self,
+        tz_offset: int,
+        dst_offset: int = 0,
+        dst_start: Optional[DstRule] = None,
+        dst_end: Optional[DstRule] = None,
+    ) -> None:
+        self.tz_offset = tz_offset
+        self.dst_offset = dst_offset if dst_start is not None and dst_end is not None else 0
+        self.dst_start = dst_start
+        self.dst_end = dst_end
+        self.__transitions: Dict[int, Tuple[int, int]] = {}
+
+    @classmethod
+    def from_espi(cls, config: espi.TimeConfiguration) -> "LocalTimeRules":
+        """Rules of ``config``, compiled once for every distinct configuration."""
+        return compile_rules(
+            config.tz_offset or 0, config.dst_offset or 0, config.dst_start_rule, config.dst_end_rule
+        )
+
+    def transitions(self, year: int) -> Tuple[int, int]:
+        """UTC epoch seconds at which DST starts and ends in ``year``."""
+        cached = self.__transitions.get(year)
+        if cached is None:
+            assert self.dst_start is not None and self.dst_end is not None
+            start = self.dst_start.local_seconds(year) - self.tz_offset
+            end = self.dst_end.local_seconds(year) - self.tz_offset - self.dst_offset
+            cached = self.__transitions[year] = (start, end)
+        return cached
+
+    def offset_changes(self, first: int, last: int) -> Tuple[List[int], List[int]]:
+        """UTC epoch seconds at which the offset changes, and the offset from each on.
+
+        The first change is a sentinel before ``first`` and the changes cover
+        every timestamp up to ``last``.
+        """
+        if not self.dst_offset:
+            return [first], [self.tz_offset]
+
+        changes: List[Tuple[int, int]] = []
+        first_year = datetime.fromtimestamp(first, timezone.utc).year - 1
+        last_year = datetime.fromtimestamp(last, timezone.utc).year + 1
+        for year in range(first_year, last_year + 1):
+            start, end = self.transitions(year)
+            changes.append((start, self.tz_offset + self.dst_offset))
+            changes.append((end, self.tz_offset))
+        changes.sort()
+        return [change for change, _ in changes], [offset for _, offset in changes]
+
+    def utc_offset(self, epoch: int) -> int:
+        changes, offsets = self.offset_changes(epoch, epoch)
+        index = bisect_right(changes, epoch) - 1
+        return offsets[index] if index >= 0 else self.tz_offset
+
+    def offsets(self, starts: Sequence[int]) -> "array[int]":
+        """UTC offset in seconds of every timestamp in ``starts``."""
+        result = array("q")
+        if not len(starts):
+            return result
+        if not self.dst_offset:
+            result.extend(repeat(self.tz_offset, len(starts)))
+            return result
+
+        changes, offsets = self.offset_changes(min(starts), max(starts))
+        if all(map(le, starts, islice(starts, 1, None))):
+            # Sorted timestamps, fill a run of equal offsets at a time
+            position = 0
+            for offset, change in zip(offsets, changes[1:]):
+                end = bisect_left(starts, change, position)
+                result.extend(repeat(offset, end - position))
+                position = end
+            result.extend(repeat(offsets[-1], len(starts) - position))
+        else:
+            result.extend(offsets[bisect_right(changes, start) - 1] for start in starts)
+        return result
+
+    def to_local(self, starts: Sequence[int]) -> "array[int]":
+        """Local wall clock time of every timestamp as seconds since the epoch."""
+        return array("q", map(add, starts, self.offsets(starts)))
+
+    def local_day_keys(self, starts: Sequence[int]) -> "array[int]":
+        """Local day of every timestamp as days since 1970-01-01, see ``key_to_date``."""
+        return array("q", map(floordiv, self.to_local(starts), repeat(DAY)))
+
+    def local_hour_keys(self, starts: Sequence[int]) -> "array[int]":
+        """Local hour of every timestamp as hours since 1970-01-01T00:00."""
+        return array("q", map(floordiv, self.to_local(starts), repeat(3600)))
+
+    def tzinfo(self) -> "EspiTimeZone":
+        return EspiTimeZone(self)
+
+
+def key_to_date(day_key: int) -> date:
+    return date.fromordinal(day_key + EPOCH_ORDINAL)
+
+
+@lru_cache(maxsize=None)
+def compile_rules(
+    tz_offset: int, dst_offset: int, dst_start_rule: Optional[bytes], dst_end_rule: Optional[bytes]
+) -> LocalTimeRules:
+    """Rules without DST when ``dst_offset`` is 0 or a rule is missing or in ``NO_DST_RULES``."""
+    if (
+        not dst_offset
+        or not dst_start_rule
+        or not dst_end_rule
+        or rule_to_int(dst_start_rule) in NO_DST_RULES
+        or rule_to_int(dst_end_rule) in NO_DST_RULES
+    ):
+        return LocalTimeRules(tz_offset)
+    return LocalTimeRules(tz_offset, dst_offset, DstRule.decode(dst_start_rule), DstRule.decode(dst_end_rule))
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class EspiTimeZone(tzinfo):
+    """``tzinfo`` that applies ``LocalTimeRules``, e.g. for ``MeterReading.resample``."""
+
+    def __init__(self, rules: LocalTimeRules) -> None:
+        self.rules = rules
+
+    @override
+    def utcoffset(self, dt: Optional[datetime]) -> timedelta:
+        if dt is None:
+            return timedelta(seconds=self.rules.tz_offset)
+        local = (dt.replace(tzinfo=None) - EPOCH) // timedelta(seconds=1)
+        offset = self.rules.utc_offset(local - self.rules.tz_offset)
+        if offset != self.rules.tz_offset and self.rules.utc_offset(local - offset) != offset:
+            offset = self.rules.tz_offset
+        return timedelta(seconds=offset)
+
+    @override
+    def dst(self, dt: Optional[datetime]) -> timedelta:
+        return self.utcoffset(dt) - timedelta(seconds=self.rules.tz_offset)
+
+    @override
+    def tzname(self, dt: Optional[datetime]) -> str:
+        return timezone(self.utcoffset(dt)).tzname(None)
+
+    @override
+    def fromutc(self, dt: datetime) -> datetime:
+        epoch = (dt.replace(tzinfo=None) - EPOCH) // timedelta(seconds=1)
+        return dt + timedelta(seconds=self.rules.utc_offset(epoch))
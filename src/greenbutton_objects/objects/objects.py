@@ -1,11 +1,24 @@
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from decimal import Decimal
-from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone, tzinfo
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from typing_extensions import override
 
 import greenbutton_objects.data.espi as espi
-from greenbutton_objects.objects import UNIT_SYMBOL_DESCRIPTIONS, QualityOfReading, ServiceKind, UnitSymbol
-from greenbutton_objects.util import get_value
+from greenbutton_objects.objects import (
+    QUALITY_OF_READING_BY_VALUE,
+    UNIT_SYMBOL_DESCRIPTIONS,
+    QualityOfReading,
+    ServiceKind,
+    UnitSymbol,
+)
+from greenbutton_objects.objects.columns import MISSING_CODE, ReadingColumns, as_seconds
+from greenbutton_objects.objects.compact import CompactIntervalBlock
+from greenbutton_objects.objects.local_time import LocalTimeRules
+from greenbutton_objects.objects.resample import Buckets, Frequency, resample
+from greenbutton_objects.objects.time_index import ChainedView, ReadingsView, TimeIndex, Timestamp, to_epoch
+from greenbutton_objects.util import LazyField, get_value
 
 
 @dataclass
@@ -37,6 +50,8 @@ class IntervalReading:
         0 means not applicable. Even though CPP is usually considered a specialized
         form of time of use 'tou', this attribute is defined explicitly for flexibility.
     :ivar parent: Reference to the parent interval block
+    :ivar start_epoch: Start of ``time_period`` in epoch seconds
+    :ivar end_epoch: End of ``time_period`` in epoch seconds
     """
 
     time_period: DateTimeInterval
@@ -51,48 +66,114 @@ class IntervalReading:
     quality_of_reading: QualityOfReading = QualityOfReading.MISSING
     reading_type: Optional[espi.ReadingType] = None
 
-    __cached_value: Optional[float] = None
+    start_epoch: int = field(init=False, repr=False, compare=False)
+    end_epoch: int = field(init=False, repr=False, compare=False)
 
-    @property
-    def start(self) -> datetime:
+    __start = None  # type: Optional[datetime]
+
+    def __post_init__(self) -> None:
+        #  Some providers produce feeds that are not compatible with the XSD schema,
+        #  as_seconds normalizes the start once so every later access is cheap
         if self.time_period is None:
-            return datetime.utcfromtimestamp(0)
-        #  The type checking is ignored for the lines below
-        #  because these conditions should never happen
-        #  unfortunately some providers produce feeds that are not compatible
-        #  with the defined XSD schema
-        if type(self.time_period.start) is str:  # type: ignore
-            time_start = datetime.utcfromtimestamp(int(Decimal(self.time_period.start)))  # type: ignore
-        elif type(self.time_period.start) is int:  # type: ignore
-            time_start = datetime.utcfromtimestamp(self.time_period.start)  # type: ignore
+            self.start_epoch = self.end_epoch = 0
         else:
-            time_start = self.time_period.start
-        return time_start
+            self.start_epoch = as_seconds(self.time_period.start)
+            self.end_epoch = self.start_epoch + as_seconds(self.time_period.duration)
+
+    @property
+    def start(self) -> datetime:
+        if self.__start is None:
+            self.__start = datetime.utcfromtimestamp(self.start_epoch)
+        return self.__start
+
+    __value = None  # type: Optional[float]
 
     @property
     def value(self) -> float:
-        if (
-            self.__cached_value is None
-            and self.reading_type is not None
-            and self.parent is not None
-            and self.parent.multiplier is not None
-        ):
-            self.__cached_value = self.raw_value * self.parent.multiplier
-        else:
-            raise ValueError("Cannot auto scale raw_value. Not enough data")
-        return self.__cached_value
+        """``raw_value`` scaled by the multiplier of ``parent``.
+
+        Blocks set the values of their readings in bulk when they are built or
+        rescaled, the product is only computed here for readings created on their own.
+        """
+        if self.__value is None:
+            if self.parent is None or self.parent.multiplier is None:
+                raise ValueError("Cannot auto scale raw_value. Not enough data")
+            self.__value = self.raw_value * self.parent.multiplier
+        return self.__value
+
+    @value.setter
+    def value(self, value: float) -> None:
+        self.__value = value
 
 
 @dataclass
 class IntervalBlock:
+    """
+    Time sequence of readings of the same ReadingType.
+
+    The readings are stored in ``columns``. Unless they are passed in, the
+    ``readings`` objects are created from the columns on first access.
+    """
+
     uri: str
     interval: DateTimeInterval
-    readings: List[IntervalReading] = field(default_factory=list)
+    readings: LazyField[List[IntervalReading]] = LazyField(lambda block: block.build_readings())
 
     multiplier: Optional[float] = None
     reading_power_of_ten: Optional[float] = None
+    columns: ReadingColumns = field(default_factory=ReadingColumns)
+    reading_type: Optional[espi.ReadingType] = None
+
+    def __post_init__(self) -> None:
+        if self.readings_materialized and not len(self.columns):
+            self.columns = ReadingColumns.from_readings(self.readings)
+            if self.multiplier is not None:
+                self.columns.scale(self.multiplier)
+
+    @override
+    def __getstate__(self) -> Dict[str, Any]:
+        # Readings are rebuilt from the columns, which pickle far more compactly
+        state = self.__dict__.copy()
+        state.pop("readings", None)
+        return state
+
+    @property
+    def readings_materialized(self) -> bool:
+        return "readings" in self.__dict__
+
+    def build_readings(self) -> List[IntervalReading]:
+        columns = self.columns
+        readings: List[IntervalReading] = []
+        for i in range(len(columns)):
+            tou = columns.tou[i]
+            consumption_tier = columns.consumption_tier[i]
+            readings.append(
+                IntervalReading(
+                    time_period=espi.DateTimeInterval(  # type: ignore
+                        duration=columns.duration[i], start=columns.start[i]
+                    ),
+                    raw_value=columns.raw_value[i],
+                    consumption_tier=consumption_tier if consumption_tier != MISSING_CODE else None,
+                    tou=tou if tou != MISSING_CODE else None,
+                    cpp=columns.cpp[i],
+                    parent=self,
+                    cost=columns.cost[i],
+                    quality_of_reading=QUALITY_OF_READING_BY_VALUE[columns.quality[i]],
+                    reading_type=self.reading_type,
+                )
+            )
+        self.scale_readings(readings)
+        return readings
+
+    def scale_readings(self, readings: List[IntervalReading]) -> None:
+        """Set the value of every reading from the scaled ``columns.value``."""
+        values = self.columns.value
+        if len(values) == len(readings):
+            for reading, value in zip(readings, values):
+                reading.value = value
 
     def compute_multiplier(self, reading_type: espi.ReadingType) -> None:
+        self.reading_type = reading_type
         reading_power_ten = get_value(
             reading_type.power_of_ten_multiplier,
             src_type=espi.UnitMultiplierKindValue,
@@ -101,23 +182,97 @@ class IntervalBlock:
         )
         self.reading_power_of_ten = reading_power_ten.value
         self.multiplier = 10.0**self.reading_power_of_ten
+        self.columns.scale(self.multiplier)
+        if self.readings_materialized:
+            self.scale_readings(self.readings)
 
 
 @dataclass
 class MeterReading:
+    """
+    :ivar interval_readings: Readings of all interval blocks, materialized on
+        first access unless they are passed in
+    """
+
     title: str
     uri: str
     reading_type: espi.ReadingType
-    interval_readings: Tuple[IntervalReading, ...] = field(default_factory=tuple)
+    interval_readings: LazyField[Tuple[IntervalReading, ...]] = LazyField(
+        lambda mr: tuple(chain.from_iterable(ib.readings for ib in mr.intervalBlock))
+    )
     intervalBlock: Tuple[IntervalBlock, ...] = field(default_factory=tuple)
 
     __uom_symbol = None
     __uom_description = None
+    __columns = None  # type: Optional[ReadingColumns]
+    __time_index = None  # type: Optional[TimeIndex]
+
+    @override
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        if self.intervalBlock:
+            state.pop("interval_readings", None)
+        state.pop("_MeterReading__columns", None)
+        state.pop("_MeterReading__time_index", None)
+        return state
+
+    def compact_blocks(self) -> Tuple[CompactIntervalBlock, ...]:
+        """Slotted copies of the interval blocks sharing their columns, see ``objects.compact``."""
+        return tuple(CompactIntervalBlock.from_block(ib) for ib in self.intervalBlock)
 
     def patch(self) -> None:
         for r in self.interval_readings:
             r.reading_type = self.reading_type
 
+    def compute_multipliers(self) -> None:
+        """Scale the readings of every block from ``reading_type``, a column at a time.
+
+        Materialized readings get their new value as well, so ``IntervalReading.value``
+        stays a plain attribute read.
+        """
+        for ib in self.intervalBlock:
+            ib.compute_multiplier(self.reading_type)
+        self.__columns = None
+
+    @property
+    def columns(self) -> ReadingColumns:
+        """Readings of all interval blocks, in the same order as ``interval_readings``."""
+        if self.__columns is None:
+            if self.intervalBlock or "interval_readings" not in self.__dict__:
+                self.__columns = ReadingColumns.concat(ib.columns for ib in self.intervalBlock)
+            else:
+                # Readings passed in without their interval blocks
+                self.__columns = ReadingColumns.from_readings(self.interval_readings)
+        return self.__columns
+
+    @property
+    def time_index(self) -> TimeIndex:
+        """Positions of ``interval_readings`` sorted by start, built on first access."""
+        if self.__time_index is None:
+            self.__time_index = TimeIndex(self.columns.start)
+        return self.__time_index
+
+    def readings_between(self, start: Timestamp, end: Timestamp) -> Sequence[IntervalReading]:
+        """Readings that start in ``[start, end)``, in start order.
+
+        ``start`` and ``end`` are epoch seconds or datetimes, naive datetimes are UTC.
+        The result is a view over ``interval_readings``. Until those are materialized,
+        only the interval blocks holding the readings that are accessed create theirs.
+        """
+        positions = self.time_index.positions(to_epoch(start), to_epoch(end))
+        if "interval_readings" in self.__dict__ or not self.intervalBlock:
+            return ReadingsView(self.interval_readings, positions)
+        blocks = self.intervalBlock
+        return ReadingsView(
+            ChainedView([len(ib.columns) for ib in blocks], lambda part: blocks[part].readings), positions
+        )
+
+    def resample(
+        self, freq: Frequency, how: str = "sum", tz: tzinfo = timezone.utc, prorate: bool = True
+    ) -> Buckets:
+        """Aggregate the scaled readings into time buckets, see ``resample.resample``."""
+        return resample(self.columns, freq, how=how, tz=tz, prorate=prorate)
+
     @property
     def uom_symbol(self) -> str:
         if self.__uom_symbol is None:
@@ -169,3 +324,14 @@ class UsagePoint:
     electric_power_usage_summary: Optional[espi.ElectricPowerUsageSummary] = None
     local_time_parameters: Optional[espi.TimeConfiguration] = None
     status: int = -1
+
+    def readings_between(self, start: Timestamp, end: Timestamp) -> Tuple[Sequence[IntervalReading], ...]:
+        """``MeterReading.readings_between`` of every meter reading, in the same order."""
+        return tuple(mr.readings_between(start, end) for mr in self.meter_readings)
+
+    @property
+    def local_time(self) -> Optional[LocalTimeRules]:
+        """Compiled ``local_time_parameters``, None when the feed has none."""
+        if self.local_time_parameters is None:
+            return None
+        return LocalTimeRules.from_espi(self.local_time_parameters)
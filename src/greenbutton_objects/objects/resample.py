@@ -0,0 +1,155 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Callable, Dict, List, Union
+
+from greenbutton_objects.objects.columns import ReadingColumns
+
+AGGREGATIONS = ("sum", "mean", "max", "min", "count")
+CALENDAR_UNITS = ("hour", "day", "week", "month", "year")
+
+Frequency = Union[str, int, timedelta]
+
+
+@dataclass
+class Buckets:
+    """Readings aggregated into time buckets, stored column by column.
+
+    Only buckets that overlap at least one reading are present.
+
+    :ivar start: Start of the bucket in epoch seconds
+    :ivar duration: Duration of the bucket in seconds
+    :ivar value: Aggregated value of the readings in the bucket
+    """
+
+    start: "array[int]" = field(default_factory=lambda: array("q"))
+    duration: "array[int]" = field(default_factory=lambda: array("i"))
+    value: "array[float]" = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+def local_midnight(day: date, tz: tzinfo) -> int:
+    return int(datetime.combine(day, time(), tzinfo=tz).timestamp())
+
+
+def calendar_edges(first: int, last: int, unit: str, tz: tzinfo) -> List[int]:
+    """Bucket edges of a calendar ``unit`` in ``tz`` that cover ``[first, last]``."""
+    local = datetime.fromtimestamp(first, tz)
+    if unit == "hour":
+        edge = int(local.replace(minute=0, second=0, microsecond=0).timestamp())
+        return list(range(edge, last + 3601, 3600))
+
+    next_day: Callable[[date], date]
+    day = local.date()
+    if unit == "day":
+        next_day = lambda d: d + timedelta(days=1)  # noqa: E731
+    elif unit == "week":
+        day -= timedelta(days=day.weekday())
+        next_day = lambda d: d + timedelta(days=7)  # noqa: E731
+    elif unit == "month":
+        day = day.replace(day=1)
+        next_day = lambda d: d.replace(year=d.year + d.month // 12, month=d.month % 12 + 1)  # noqa: E731
+    else:
+        day = day.replace(month=1, day=1)
+        next_day = lambda d: d.replace(year=d.year + 1)  # noqa: E731
+
+    edges = [local_midnight(day, tz)]
+    while edges[-1] <= last:
+        day = next_day(day)
+        edges.append(local_midnight(day, tz))
+    return edges
+
+
+def bucket_edges(first: int, last: int, freq: Frequency, tz: tzinfo) -> List[int]:
+    if isinstance(freq, str):
+        if freq not in CALENDAR_UNITS:
+            raise ValueError(f"Unknown frequency {freq!r}, expected one of {CALENDAR_UNITS} or seconds")
+        return calendar_edges(first, last, freq, tz)
+
+    width = int(freq.total_seconds()) if isinstance(freq, timedelta) else freq
+    if width <= 0:
+        raise ValueError("Bucket width must be positive")
+    # Fixed width buckets are aligned to the epoch
+    return list(range(first - first % width, last + width + 1, width))
+
+
+def resample(
+    columns: ReadingColumns,
+    freq: Frequency,
+    how: str = "sum",
+    tz: tzinfo = timezone.utc,
+    prorate: bool = True,
+) -> Buckets:
+    """Aggregate readings into buckets.
+
+    ``freq`` is a calendar unit ("hour", "day", "week", "month" or "year") whose
+    edges follow the wall clock of ``tz``, or a fixed bucket width in seconds or as
+    a ``timedelta``. ``how`` is one of "sum", "mean", "max", "min" or "count".
+
+    With ``prorate`` set, a reading that straddles bucket edges is split between the
+    buckets in proportion to the time it spends in each: it adds that fraction of
+    its value to the sum and that fraction of one to the count, and mean is their
+    ratio. max and min consider the full value of every reading that overlaps a
+    bucket. Without ``prorate`` each reading belongs to the bucket it starts in.
+    Readings without a value are ignored.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {how!r}, expected one of {AGGREGATIONS}")
+
+    buckets = Buckets()
+    values = columns.value if len(columns.value) == len(columns) else columns.raw_value
+    if not len(columns):
+        return buckets
+
+    starts = columns.start
+    durations = columns.duration
+    first = min(starts)
+    last = max(map(int.__add__, starts, durations))
+    edges = bucket_edges(first, last, freq, tz)
+
+    totals: Dict[int, float] = {}
+    weights: Dict[int, float] = {}
+    extremes: Dict[int, float] = {}
+    pick = max if how == "max" else min
+    track_extremes = how in ("max", "min")
+
+    for start, duration, value in zip(starts, durations, values):
+        if value != value:
+            continue
+        end = start + duration
+        index = bisect_right(edges, start) - 1
+        if not prorate or duration <= 0 or end <= edges[index + 1]:
+            parts = [(index, 1.0)]
+        else:
+            parts = []
+            while start < end:
+                part_end = min(end, edges[index + 1])
+                parts.append((index, (part_end - start) / duration))
+                start = part_end
+                index += 1
+
+        for index, fraction in parts:
+            if track_extremes:
+                extreme = extremes.get(index)
+                extremes[index] = value if extreme is None else pick(extreme, value)
+            else:
+                totals[index] = totals.get(index, 0.0) + value * fraction
+                weights[index] = weights.get(index, 0.0) + fraction
+
+    if track_extremes:
+        result = extremes
+    elif how == "sum":
+        result = totals
+    elif how == "count":
+        result = weights
+    else:
+        result = {index: totals[index] / weight for index, weight in weights.items() if weight}
+
+    for index in sorted(result):
+        buckets.start.append(edges[index])
+        buckets.duration.append(edges[index + 1] - edges[index])
+        buckets.value.append(result[index])
+    return buckets
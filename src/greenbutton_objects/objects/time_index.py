@@ -0,0 +1,109 @@
+import calendar
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from itertools import accumulate, islice
+from operator import le
+from typing import Callable, List, Optional, Sequence, TypeVar, Union, overload
+
+from typing_extensions import override
+
+T = TypeVar("T")
+
+Timestamp = Union[int, datetime]
+
+
+def to_epoch(value: Timestamp) -> int:
+    """Epoch seconds of ``value``, naive datetimes are UTC like ``IntervalReading.start``."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple())
+        return int(value.timestamp())
+    return value
+
+
+class TimeIndex:
+    """Positions of readings sorted by their start.
+
+    Readings of overlapping or out of order IntervalBlocks are sorted once, feeds
+    that are already in order are indexed without copying their starts.
+    """
+
+    def __init__(self, starts: Sequence[int]) -> None:
+        self.order: Optional["array[int]"] = None
+        self.starts = starts
+        if not all(map(le, starts, islice(starts, 1, None))):
+            self.order = array("q", sorted(range(len(starts)), key=starts.__getitem__))
+            self.starts = array("q", map(starts.__getitem__, self.order))
+
+    def positions(self, start: int, end: int) -> Sequence[int]:
+        """Positions of the readings that start in ``[start, end)``, in start order.
+
+        The result is a ``range`` or a ``memoryview`` over the index, not a copy.
+        """
+        low = bisect_left(self.starts, start)
+        high = max(bisect_left(self.starts, end, low), low)
+        if self.order is None:
+            return range(low, high)
+        return memoryview(self.order)[low:high]
+
+
+class ReadingsView(Sequence[T]):
+    """Read-only view of ``items`` at ``positions``."""
+
+    def __init__(self, items: Sequence[T], positions: Sequence[int]) -> None:
+        self.items = items
+        self.positions = positions
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ReadingsView[T]": ...
+
+    @override
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, "ReadingsView[T]"]:
+        if isinstance(index, slice):
+            return ReadingsView(self.items, self.positions[index])
+        return self.items[self.positions[index]]
+
+    @override
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @override
+    def __repr__(self) -> str:
+        return f"ReadingsView({list(self)!r})"
+
+
+class ChainedView(Sequence[T]):
+    """Read-only concatenation of parts that are only fetched when they are indexed.
+
+    Part ``i`` has ``lengths[i]`` items and is returned by ``get_part(i)``, e.g.
+    the readings of one IntervalBlock.
+    """
+
+    def __init__(self, lengths: Sequence[int], get_part: Callable[[int], Sequence[T]]) -> None:
+        self.offsets = list(accumulate(lengths))
+        self.get_part = get_part
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    @override
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index out of range")
+        part = bisect_right(self.offsets, index)
+        return self.get_part(part)[index - self.offsets[part - 1] if part else index]
+
+    @override
+    def __len__(self) -> int:
+        return self.offsets[-1] if self.offsets else 0
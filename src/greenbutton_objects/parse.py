@@ -1,31 +1,250 @@
 #!/usr/bin/python
 
+import dataclasses
+import os
+import threading
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import IO, Deque, Dict, Iterable, Iterator, List, Optional, Type, Union
+
 from xsdata.formats.dataclass.context import XmlContext
 from xsdata.formats.dataclass.parsers import XmlParser
 from xsdata.formats.dataclass.parsers.config import ParserConfig
+from xsdata.formats.dataclass.parsers.handlers import XmlEventHandler
+from xsdata.formats.dataclass.parsers.mixins import XmlHandler
 
 import greenbutton_objects.data.atom as atom
+import greenbutton_objects.objects as ob
 from greenbutton_objects.atom.entry_forest import EntryForest
 from greenbutton_objects.atom.href_forest import HRefForest
+from greenbutton_objects.data import espi
 from greenbutton_objects.feed.feed import ObjectFeed
+from greenbutton_objects.feed.interval_decoder import IntervalBlockReader
+from greenbutton_objects.feed.scan import FeedSummary, summarize
+from greenbutton_objects.profiling import ParseProfiler, profile_stage
+from greenbutton_objects.source import FeedSource, open_source
+from greenbutton_objects.util import InternPool
 
 
-def parse_feed(filename: str) -> ObjectFeed:
-    data = parse_xml(filename)
+def parse_feed(
+    source: FeedSource,
+    lazy: bool = False,
+    profiler: Optional[ParseProfiler] = None,
+    pool: Optional[InternPool] = None,
+) -> ObjectFeed:
+    """Parse a feed into an ObjectFeed.
 
-    href_forest = HRefForest().build(data)
-    entry_forest = EntryForest().build(href_forest)
-    object_feed = ObjectFeed().build(entry_forest)
+    ``source`` may be a path, a bytes-like object or a binary file object, see
+    ``open_source``. Gzip and zip compressed feeds are decompressed on the fly.
+    Pass a ``ParseProfiler`` to measure the time and memory of every stage.
+    Feeds parsed with the same ``pool`` share their equal URIs, titles, reading
+    types and local time parameters.
+    """
+    if pool is None:
+        pool = InternPool()
+    object_feed = ObjectFeed(lazy=lazy, pool=pool)
+    with open_source(source) as stream:
+        entry_forest = read_entry_forest(stream, profiler, pool)
 
+    with profile_stage(profiler, "build") as counts:
+        object_feed.build(entry_forest)
+        meter_readings = [mr for up in object_feed.usage_points for mr in up.meter_readings]
+        counts["usage_points"] = len(object_feed.usage_points)
+        counts["meter_readings"] = len(meter_readings)
+        counts["interval_blocks"] = sum(len(mr.intervalBlock) for mr in meter_readings)
+        counts["readings"] = sum(len(ib.columns) for mr in meter_readings for ib in mr.intervalBlock)
     return object_feed
 
 
+def parse_feed_stream(source: FeedSource, lazy: bool = False) -> Iterator[ob.UsagePoint]:
+    """Parse a feed entry by entry and yield its usage points.
+
+    Unlike ``parse_xml`` the full ``atom.Feed`` is never built. IntervalBlock entries
+    are decoded as soon as they are read and their XML is released, so the peak
+    memory is bounded by the largest single entry plus the converted readings.
+    Atom does not order entries, so usage points are yielded once the whole link
+    graph has been read. See ``ObjectFeed`` for ``lazy``.
+    """
+    object_feed = ObjectFeed(lazy=lazy)
+    with open_source(source) as stream:
+        entry_forest = read_entry_forest(stream)
+    yield from object_feed.iter_usage_points(entry_forest)
+
+
+def scan_feed(source: FeedSource) -> FeedSummary:
+    """Summarize the usage points, meter readings and date ranges of a feed.
+
+    IntervalReadings are only counted, never decoded or bound, so this takes a
+    fraction of the time and memory of ``parse_feed``. Date ranges come from the
+    ``interval`` of every IntervalBlock.
+    """
+    href_forest = HRefForest()
+    reading_counts: Dict[str, List[int]] = {}
+    reader = IntervalBlockReader(get_xml_parser(handler=XmlEventHandler))
+    with open_source(source) as stream:
+        for entry, counts in reader.read_headers(stream):
+            node = href_forest.add_entry(entry)
+            if counts is not None:
+                reading_counts[node.uri] = counts
+    href_forest.link()
+    return summarize(EntryForest().build(href_forest), reading_counts)
+
+
+@dataclasses.dataclass
+class ParseResult:
+    """Outcome of parsing one file with ``parse_many``.
+
+    :ivar source: The path that was parsed
+    :ivar feed: The parsed feed, None when parsing failed
+    :ivar error: The exception raised while parsing, None on success
+    """
+
+    source: str
+    feed: Optional[ObjectFeed] = None
+    error: Optional[BaseException] = None
+
+
+def parse_many(
+    paths: Iterable[Union[str, "os.PathLike[str]"]],
+    workers: Optional[int] = None,
+    executor: str = "process",
+    ordered: bool = True,
+) -> Iterator[ParseResult]:
+    """Parse many files in parallel and yield a ``ParseResult`` per file.
+
+    ``executor`` is either "process" or "thread". Results are yielded in submission
+    order when ``ordered`` is set, otherwise as soon as they complete. A file that
+    fails to parse yields a result carrying the error and does not stop the batch.
+    At most a few files per worker are in flight, so ``paths`` may be a lazy
+    iterable over a very large directory. The feeds of a thread batch share one
+    ``InternPool``, feeds from worker processes are unpickled separately anyway.
+    """
+    pool: Executor
+    intern_pool = None
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=warmup)
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers, initializer=warmup)
+        intern_pool = InternPool()
+    else:
+        raise ValueError(f"Unknown executor {executor!r}, expected 'process' or 'thread'")
+
+    max_in_flight = 4 * (workers or os.cpu_count() or 1)
+    pending: Deque["Future[ParseResult]"] = deque()
+    sources = iter(paths)
+    with pool:
+        while True:
+            for path in sources:
+                pending.append(pool.submit(_parse_file, os.fspath(path), intern_pool))
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                return
+
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+
+
+def _parse_file(path: str, pool: Optional[InternPool] = None) -> ParseResult:
+    try:
+        return ParseResult(source=path, feed=parse_feed(path, pool=pool))
+    except Exception as error:
+        return ParseResult(source=path, error=error)
+
+
+def read_entry_forest(
+    source: Union[str, IO[bytes]], profiler: Optional[ParseProfiler] = None, pool: Optional[InternPool] = None
+) -> EntryForest:
+    """Read the entries of a feed into an EntryForest.
+
+    IntervalReadings are decoded straight into columns kept on the IntervalBlock
+    nodes, every other element is bound by xsdata. The forest can be built into
+    any number of ``ObjectFeed`` objects.
+    """
+    href_forest = HRefForest(pool)
+
+    with profile_stage(profiler, "read") as counts:
+        reader = IntervalBlockReader(get_xml_parser(handler=XmlEventHandler))
+        entries = 0
+        for entry, interval_columns in reader.read_decoded(source):
+            entries += 1
+            node = href_forest.add_entry(entry)
+            node.interval_columns = interval_columns
+        counts["entries"] = entries
+
+    with profile_stage(profiler, "link") as counts:
+        href_forest.link()
+        counts["href_nodes"] = len(href_forest.forest)
+
+    with profile_stage(profiler, "entry_forest") as counts:
+        entry_forest = EntryForest().build(href_forest)
+        counts["nodes"] = len(entry_forest)
+    return entry_forest
+
+
 def parse_xml(filename: str) -> atom.Feed:
     data = get_xml_parser().parse(filename, clazz=atom.Feed)
     return data
 
 
-def get_xml_parser() -> XmlParser:
-    config = ParserConfig(fail_on_unknown_properties=False)
-    context = XmlContext()
-    return XmlParser(context=context, config=config)
+_context_lock = threading.Lock()
+_context: Optional[XmlContext] = None
+_parsers = threading.local()
+
+
+def get_xml_context() -> XmlContext:
+    """Return the process wide xsdata context shared by all parsers."""
+    global _context
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                _context = XmlContext()
+    return _context
+
+
+def warmup() -> XmlContext:
+    """Build the binding metadata for the atom and ESPI models up front.
+
+    Long-running workers can call this once at startup so the first parsed file
+    does not pay for inspecting the generated dataclasses.
+    """
+    context = get_xml_context()
+    with _context_lock:
+        context.build_recursive(atom.Feed)
+        # ESPI resources are bound through the wildcard content of atom entries
+        for name in espi.__all__:
+            clazz = getattr(espi, name)
+            if dataclasses.is_dataclass(clazz):
+                context.build_recursive(clazz, atom.Feed.Meta.namespace)
+        context.build_xsi_cache()
+    return context
+
+
+def get_xml_parser(handler: Optional[Type[XmlHandler]] = None) -> XmlParser:
+    """Return a parser bound to the shared context.
+
+    Parsers keep per-document state, so they are cached per thread.
+    """
+    cache: Dict[Optional[Type[XmlHandler]], XmlParser] = _parsers.__dict__.setdefault("cache", {})
+    parser = cache.get(handler)
+    if parser is None:
+        config = ParserConfig(fail_on_unknown_properties=False)
+        context = get_xml_context()
+        if handler is None:
+            parser = XmlParser(context=context, config=config)
+        else:
+            parser = XmlParser(context=context, config=config, handler=handler)
+        cache[handler] = parser
+    return parser
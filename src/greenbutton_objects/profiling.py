@@ -0,0 +1,89 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageStats:
+    """Resources used by one stage of ``parse_feed``.
+
+    :ivar name: Stage name: read, link, entry_forest or build
+    :ivar wall_time: Elapsed time in seconds
+    :ivar cpu_time: CPU time of the current process in seconds
+    :ivar peak_memory: Peak bytes allocated during the stage above the level at its
+        start, None unless the profiler traces memory
+    :ivar counts: Number of objects the stage handled, e.g. entries or readings
+    """
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: Optional[int] = None
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+class ParseProfiler:
+    """Collect a ``StageStats`` for every stage of ``parse_feed``.
+
+    ``on_stage`` is called with each ``StageStats`` as soon as its stage finishes.
+    With ``trace_memory`` set, peak memory is measured with ``tracemalloc``, which
+    slows parsing down considerably and is therefore off by default.
+    """
+
+    def __init__(
+        self, on_stage: Optional[Callable[[StageStats], None]] = None, trace_memory: bool = False
+    ) -> None:
+        self.on_stage = on_stage
+        self.trace_memory = trace_memory
+        self.stages: List[StageStats] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        stats = StageStats(name=name)
+
+        started_tracing = False
+        baseline = 0
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield stats.counts
+        finally:
+            stats.cpu_time = time.process_time() - cpu_start
+            stats.wall_time = time.perf_counter() - wall_start
+            if self.trace_memory:
+                stats.peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+                if started_tracing:
+                    tracemalloc.stop()
+
+        self.stages.append(stats)
+        if self.on_stage is not None:
+            self.on_stage(stats)
+
+    def report(self) -> str:
+        lines = [f"{'stage':<14}{'wall s':>10}{'cpu s':>10}{'peak MiB':>10}  counts"]
+        for stats in self.stages:
+            peak = "-" if stats.peak_memory is None else f"{stats.peak_memory / 2**20:.2f}"
+            counts = ", ".join(f"{name}={count}" for name, count in stats.counts.items())
+            lines.append(
+                f"{stats.name:<14}{stats.wall_time:>10.4f}{stats.cpu_time:>10.4f}{peak:>10}  {counts}"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_stage(profiler: Optional[ParseProfiler], name: str) -> Iterator[Dict[str, int]]:
+    """Run a stage under ``profiler``, or unmeasured when there is none."""
+    if profiler is None:
+        yield {}
+    else:
+        with profiler.stage(name) as counts:
+            yield counts
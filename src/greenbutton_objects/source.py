@@ -0,0 +1,129 @@
+"""
+Open the many forms a Green Button feed arrives in as a binary stream.
+
+Compression is detected from the leading bytes rather than the file name, so
+gzip and zip payloads are handled the same way whether they come from a path,
+an in-memory buffer or a file object.
+"""
+
+import gzip
+import io
+import mmap
+import os
+import zipfile
+from contextlib import ExitStack, contextmanager
+from typing import IO, Iterator, Union
+
+from typing_extensions import Buffer, override
+
+FeedSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, IO[bytes]]
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+class MemoryReader(io.RawIOBase):
+    """Read-only stream over a buffer that does not copy it up front."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        self.view = memoryview(buffer).cast("B")
+        self.position = 0
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def seekable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Buffer) -> int:
+        target = memoryview(buffer).cast("B")
+        size = min(len(target), len(self.view) - self.position)
+        target[:size] = self.view[self.position : self.position + size]
+        self.position += size
+        return size
+
+    @override
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, offset)
+        return self.position
+
+    @override
+    def tell(self) -> int:
+        return self.position
+
+    @override
+    def close(self) -> None:
+        if not self.closed:
+            self.view.release()
+        super().close()
+
+
+def peek(stream: IO[bytes], size: int) -> bytes:
+    """Return the first ``size`` bytes of ``stream`` without consuming them.
+
+    ``stream`` is either an ``io.BufferedReader`` or seekable, see ``open_source``.
+    """
+    if isinstance(stream, io.BufferedReader):
+        return stream.peek(size)[:size]
+    position = stream.tell()
+    head = stream.read(size)
+    stream.seek(position)
+    return head
+
+
+def open_zip_member(archive: zipfile.ZipFile) -> IO[bytes]:
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    xml_members = [info for info in members if info.filename.lower().endswith(".xml")]
+    if len(xml_members) == 1:
+        return archive.open(xml_members[0])
+    if len(members) == 1:
+        return archive.open(members[0])
+    raise ValueError(f"Expected a single XML document in the zip archive, found {len(xml_members)}")
+
+
+@contextmanager
+def open_source(source: FeedSource) -> Iterator[IO[bytes]]:
+    """Open ``source`` as a binary stream of uncompressed feed XML.
+
+    ``source`` may be a path, a bytes-like object or a binary file object. Plain
+    files are memory mapped, gzip and zip content is decompressed while it is read.
+    """
+    with ExitStack() as stack:
+        stream: IO[bytes]
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            stream = stack.enter_context(io.BufferedReader(MemoryReader(source)))
+        elif isinstance(source, (str, os.PathLike)):
+            file = stack.enter_context(open(source, "rb"))
+            try:
+                mapped = stack.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            except (OSError, ValueError):
+                # Empty files and special files cannot be mapped
+                stream = file
+            else:
+                stream = stack.enter_context(io.BufferedReader(MemoryReader(mapped)))
+        elif isinstance(source, io.BufferedReader) or source.seekable():
+            stream = source
+        else:
+            # Unbuffered pipes and sockets can only be peeked through a buffer. It is
+            # detached on exit, so closing it does not close ``source``
+            buffered = io.BufferedReader(source)  # type: ignore[arg-type]
+            stack.callback(buffered.detach)
+            stream = buffered
+
+        head = peek(stream, len(ZIP_MAGIC))
+        if head.startswith(GZIP_MAGIC):
+            stream = stack.enter_context(gzip.GzipFile(fileobj=stream, mode="rb"))  # type: ignore
+        elif head.startswith(ZIP_MAGIC):
+            if not stream.seekable():
+                # The zip directory is at the end of the archive
+                stream = io.BytesIO(stream.read())
+            archive = stack.enter_context(zipfile.ZipFile(stream))
+            stream = stack.enter_context(open_zip_member(archive))
+        yield stream
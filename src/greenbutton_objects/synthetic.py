@@ -0,0 +1,291 @@
+"""
+Generate synthetic Green Button feeds for load and scaling tests.
+
+Feeds are produced entry by entry, so arbitrarily large feeds can be written
+without holding them in memory::
+
+    spec = FeedSpec(usage_points=100, interval_length=900, span=365 * 86400)
+    write_feed(spec, "synthetic.xml.gz")
+
+or from the command line with ``python -m greenbutton_objects.synthetic``.
+"""
+
+import argparse
+import gzip
+import math
+import os
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import IO, Iterable, Iterator, List, Union
+
+from greenbutton_objects.objects import QualityOfReading, ServiceKind, UnitSymbol
+
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+ESPI_NAMESPACE = "http://naesb.org/espi"
+
+DAY = 24 * 3600
+
+
+@dataclass
+class FeedSpec:
+    """Shape of a synthetic feed.
+
+    :ivar usage_points: Number of usage points
+    :ivar meter_readings: Number of meter readings per usage point
+    :ivar interval_length: Duration of each interval reading in seconds
+    :ivar block_length: Duration covered by each interval block in seconds
+    :ivar start: Start of the first reading, seconds since the epoch
+    :ivar span: Duration covered by each meter reading in seconds
+    :ivar service_kind: Electricity or gas, selects the unit of measure
+    :ivar containerized: Link entries through ``up`` containers like most
+        utilities do, otherwise link every resource directly with ``related`` links
+    :ivar cost: Include a cost in every reading
+    :ivar quality: Include a ReadingQuality in every reading
+    :ivar tou: Include a time of use code in every reading
+    :ivar seed: Seed of the random noise added to the readings
+    """
+
+    usage_points: int = 1
+    meter_readings: int = 1
+    interval_length: int = 3600
+    block_length: int = DAY
+    start: int = 1672531200  # 2023-01-01T00:00:00Z
+    span: int = 365 * DAY
+    service_kind: ServiceKind = ServiceKind.ELECTRICITY
+    containerized: bool = True
+    cost: bool = False
+    quality: bool = False
+    tou: bool = False
+    seed: int = 0
+
+    @property
+    def readings_per_meter(self) -> int:
+        return self.span // self.interval_length
+
+    @property
+    def total_readings(self) -> int:
+        return self.usage_points * self.meter_readings * self.readings_per_meter
+
+
+def entry(
+    uri: str,
+    content: str,
+    entry_id: uuid.UUID,
+    updated: str,
+    title: str = "",
+    up: str = "",
+    related: Iterable[str] = (),
+) -> str:
+    links = [f'<link rel="self" href="{uri}"/>']
+    if up:
+        links.append(f'<link rel="up" href="{up}"/>')
+    links.extend(f'<link rel="related" href="{href}"/>' for href in related)
+    return (
+        f"<entry>\n<id>urn:uuid:{entry_id}</id>\n"
+        + "\n".join(links)
+        + f"\n<title>{title}</title>\n<published>{updated}</published>\n<updated>{updated}</updated>\n"
+        f'<content type="xml">\n{content}\n</content>\n</entry>\n'
+    )
+
+
+def atom_date_time(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def usage_point_content(spec: FeedSpec) -> str:
+    return (
+        f'<UsagePoint xmlns="{ESPI_NAMESPACE}"><ServiceCategory><kind>{spec.service_kind.value}</kind>'
+        "</ServiceCategory><status>1</status></UsagePoint>"
+    )
+
+
+def reading_type_content(spec: FeedSpec) -> str:
+    if spec.service_kind == ServiceKind.GAS:
+        commodity, uom, power_of_ten = 7, UnitSymbol.THERM.value, -3
+    else:
+        commodity, uom, power_of_ten = 1, UnitSymbol.WH.value, 0
+    return (
+        f'<ReadingType xmlns="{ESPI_NAMESPACE}"><accumulationBehaviour>4</accumulationBehaviour>'
+        f"<commodity>{commodity}</commodity><currency>840</currency><flowDirection>1</flowDirection>"
+        f"<intervalLength>{spec.interval_length}</intervalLength><kind>12</kind>"
+        f"<powerOfTenMultiplier>{power_of_ten}</powerOfTenMultiplier><uom>{uom}</uom></ReadingType>"
+    )
+
+
+LOCAL_TIME_PARAMETERS = (
+    f'<LocalTimeParameters xmlns="{ESPI_NAMESPACE}"><dstEndRule>B40E2000</dstEndRule>'
+    "<dstOffset>3600</dstOffset><dstStartRule>360E2000</dstStartRule>"
+    "<tzOffset>-18000</tzOffset></LocalTimeParameters>"
+)
+
+QUALITY_CODES = [QualityOfReading.VALIDATED.value] * 8 + [
+    QualityOfReading.INTERPOLATED.value,
+    QualityOfReading.FORECASTED.value,
+]
+
+
+def interval_block_content(spec: FeedSpec, block_start: int, block_end: int, rng: random.Random) -> str:
+    interval_length = spec.interval_length
+    parts = [
+        f'<IntervalBlock xmlns="{ESPI_NAMESPACE}"><interval><duration>{block_end - block_start}</duration>'
+        f"<start>{block_start}</start></interval>"
+    ]
+    append = parts.append
+    for start in range(block_start, block_end, interval_length):
+        hour = start % DAY / 3600
+        # A daily load shape with an evening peak and some noise
+        value = int(
+            (500 + 300 * math.sin((hour - 10) * math.pi / 12) + rng.random() * 100) * interval_length / 3600
+        )
+        append("<IntervalReading>")
+        if spec.cost:
+            append(f"<cost>{value * 12}</cost>")
+        if spec.quality:
+            append(f"<ReadingQuality><quality>{rng.choice(QUALITY_CODES)}</quality></ReadingQuality>")
+        append(
+            f"<timePeriod><duration>{interval_length}</duration><start>{start}</start></timePeriod>"
+            f"<value>{value}</value>"
+        )
+        if spec.tou:
+            append(f"<tou>{2 if 16 <= hour < 21 else 1}</tou>")
+        append("</IntervalReading>")
+    parts.append("</IntervalBlock>")
+    return "".join(parts)
+
+
+def iter_feed(spec: FeedSpec) -> Iterator[str]:
+    """Yield the XML text of a synthetic feed in chunks of at most one entry."""
+    rng = random.Random(spec.seed)
+    base = "https://example.com/DataCustodian/espi/1_1/resource"
+    containerized = spec.containerized
+    local_time_uri = f"{base}/LocalTimeParameters/1"
+    end = spec.start + spec.readings_per_meter * spec.interval_length
+    # Dated at the end of the readings, so a seed always gives the same feed
+    updated = atom_date_time(end)
+
+    def new_id() -> uuid.UUID:
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    yield (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="{ATOM_NAMESPACE}">\n'
+        f"<id>urn:uuid:{new_id()}</id>\n<title>Synthetic Green Button Feed</title>\n"
+        f"<updated>{updated}</updated>\n"
+        f'<link rel="self" href="{base}/Subscription/1"/>\n'
+    )
+    yield entry(
+        local_time_uri,
+        LOCAL_TIME_PARAMETERS,
+        new_id(),
+        updated,
+        title="DST For North America",
+        up=f"{base}/LocalTimeParameters" if containerized else "",
+    )
+
+    block_length = max(spec.block_length - spec.block_length % spec.interval_length, spec.interval_length)
+    for up_index in range(1, spec.usage_points + 1):
+        up_uri = f"{base}/RetailCustomer/1/UsagePoint/{up_index}"
+        mr_uris = [f"{up_uri}/MeterReading/{mr_index}" for mr_index in range(1, spec.meter_readings + 1)]
+
+        related = [f"{up_uri}/MeterReading"] if containerized else mr_uris
+        yield entry(
+            up_uri,
+            usage_point_content(spec),
+            new_id(),
+            updated,
+            title=f"Synthetic Usage Point {up_index}",
+            up=f"{base}/RetailCustomer/1/UsagePoint" if containerized else "",
+            related=[*related, local_time_uri],
+        )
+
+        for mr_uri in mr_uris:
+            reading_type_uri = f"{mr_uri}/ReadingType"
+            block_uris = [f"{mr_uri}/IntervalBlock/{start}" for start in range(spec.start, end, block_length)]
+            related = [f"{mr_uri}/IntervalBlock"] if containerized else block_uris
+            yield entry(
+                mr_uri,
+                f'<MeterReading xmlns="{ESPI_NAMESPACE}"/>',
+                new_id(),
+                updated,
+                title="Synthetic Consumption",
+                up=f"{up_uri}/MeterReading" if containerized else "",
+                related=[*related, reading_type_uri],
+            )
+            yield entry(
+                reading_type_uri,
+                reading_type_content(spec),
+                new_id(),
+                updated,
+                title="Type of Meter Reading Data",
+            )
+
+            for block_uri, block_start in zip(block_uris, range(spec.start, end, block_length)):
+                block_end = min(block_start + block_length, end)
+                yield entry(
+                    block_uri,
+                    interval_block_content(spec, block_start, block_end, rng),
+                    new_id(),
+                    updated,
+                    up=f"{mr_uri}/IntervalBlock" if containerized else "",
+                )
+
+    yield "</feed>\n"
+
+
+def write_feed(spec: FeedSpec, target: Union[str, "os.PathLike[str]", IO[str]]) -> int:
+    """Write a synthetic feed and return the number of readings written.
+
+    ``target`` is a text stream or a path. Paths ending in ``.gz`` are compressed.
+    """
+    if isinstance(target, (str, os.PathLike)):
+        if os.fspath(target).endswith(".gz"):
+            with gzip.open(target, "wt", encoding="utf-8") as out:
+                return write_feed(spec, out)
+        with open(target, "w", encoding="utf-8") as out:
+            return write_feed(spec, out)
+
+    target.writelines(iter_feed(spec))
+    return spec.total_readings
+
+
+def generate_feed(spec: FeedSpec) -> bytes:
+    """Return a synthetic feed as bytes, for feeds small enough to keep in memory."""
+    return "".join(iter_feed(spec)).encode()
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Write a synthetic Green Button feed")
+    arg_parser.add_argument("output", help="output path, compressed when it ends in .gz")
+    arg_parser.add_argument("--usage-points", type=int, default=1)
+    arg_parser.add_argument("--meter-readings", type=int, default=1)
+    arg_parser.add_argument("--interval-length", type=int, default=3600, help="seconds")
+    arg_parser.add_argument("--block-length", type=int, default=DAY, help="seconds")
+    arg_parser.add_argument("--days", type=int, default=365)
+    arg_parser.add_argument("--gas", action="store_true")
+    arg_parser.add_argument("--direct", action="store_true", help="link resources without containers")
+    arg_parser.add_argument("--cost", action="store_true")
+    arg_parser.add_argument("--quality", action="store_true")
+    arg_parser.add_argument("--tou", action="store_true")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    spec = FeedSpec(
+        usage_points=args.usage_points,
+        meter_readings=args.meter_readings,
+        interval_length=args.interval_length,
+        block_length=args.block_length,
+        span=args.days * DAY,
+        service_kind=ServiceKind.GAS if args.gas else ServiceKind.ELECTRICITY,
+        containerized=not args.direct,
+        cost=args.cost,
+        quality=args.quality,
+        tou=args.tou,
+        seed=args.seed,
+    )
+    readings = write_feed(spec, args.output)
+    print(f"Wrote {readings} readings to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
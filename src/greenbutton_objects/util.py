@@ -1,4 +1,18 @@
-from typing import Iterable, Type, TypeVar, Union
+from dataclasses import fields
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
 
 T = TypeVar("T")
 S = TypeVar("S")
@@ -21,3 +35,100 @@ def get_value(source: S, missing_val: T, dest_type: Type[T], src_type: Type[S])
     elif isinstance(source, src_type):
         value = dest_type(source.value)  # type: ignore
     return value
+
+
+def add_slots(cls: Type[T]) -> Type[T]:
+    """Recreate a dataclass with ``__slots__`` for its fields.
+
+    ``dataclass(slots=True)`` needs Python 3.10. Defaults live in the generated
+    ``__init__``, so the class attributes holding them can be dropped.
+    """
+    names = tuple(field.name for field in fields(cls))  # type: ignore[arg-type]
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+
+    if "__getstate__" not in namespace:
+        # Frozen instances reject the setattr of the default slot unpickling
+        def __getstate__(self: Any) -> List[Any]:
+            return [getattr(self, name) for name in names]
+
+        def __setstate__(self: Any, state: List[Any]) -> None:
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+
+        namespace["__getstate__"] = __getstate__
+        namespace["__setstate__"] = __setstate__
+
+    slotted: Type[T] = type(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+class LazyField(Generic[T]):
+    """Dataclass field descriptor whose value is built on first access.
+
+    The field defaults to None in ``__init__``, which leaves the value to
+    ``build(instance)``. Values passed in or assigned are kept as they are, and
+    assigning None drops the value so it is built again. The value is stored in
+    the instance ``__dict__`` under the field name.
+    """
+
+    def __init__(self, build: Callable[[Any], T]) -> None:
+        self.build = build
+        self.name = ""
+
+    def __set_name__(self, owner: Type[Any], name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: Type[Any]) -> None: ...
+
+    @overload
+    def __get__(self, instance: object, owner: Type[Any]) -> T: ...
+
+    def __get__(self, instance: Optional[object], owner: Type[Any]) -> Optional[T]:
+        if instance is None:
+            # The default dataclasses reads from the class
+            return None
+        values: Dict[str, Any] = instance.__dict__
+        try:
+            return values[self.name]  # type: ignore[no-any-return]
+        except KeyError:
+            value = values[self.name] = self.build(instance)
+            return value
+
+    def __set__(self, instance: object, value: Optional[T]) -> None:
+        if value is None:
+            instance.__dict__.pop(self.name, None)
+        else:
+            instance.__dict__[self.name] = value
+
+
+class InternPool:
+    """Single copies of equal strings and ESPI objects for one feed or batch of feeds.
+
+    URIs are repeated in the links of other entries and across feeds of the same
+    data custodian, and small ESPI objects like ReadingType and TimeConfiguration
+    are often equal between meter readings. Unlike ``sys.intern`` the pooled
+    values are released together with the pool.
+    """
+
+    def __init__(self) -> None:
+        self.__strings: Dict[str, str] = {}
+        self.__content: Dict[Tuple[type, str], Any] = {}
+
+    def string(self, value: str) -> str:
+        return self.__strings.setdefault(value, value)
+
+    def content(self, obj: T) -> T:
+        """Return the pooled object equal in content to ``obj``, or ``obj`` itself.
+
+        Pooled objects are shared by everything parsed with the pool and must not
+        be modified.
+        """
+        pooled: T = self.__content.setdefault((type(obj), repr(obj)), obj)
+        return pooled
@@ -1,9 +1,43 @@
+import csv
+import gzip
+import io
+import json
+import pickle
+import sqlite3
+import sys
+import uuid
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from math import isnan
+from xml.etree import ElementTree
 
+import pytest
 from greenbutton_objects import parse
+from greenbutton_objects.atom import EntryForest, HRefForest
+from greenbutton_objects.atom.href_forest import HRefTreeNode
+from greenbutton_objects.cache import ParseCache
+from greenbutton_objects.data import atom, espi
 from greenbutton_objects.data.espi import LocalTimeParameters
-from greenbutton_objects.objects import QualityOfReading, ServiceKind
-from greenbutton_objects.objects.objects import UsagePoint
+from greenbutton_objects.export import text
+from greenbutton_objects.export.sqlite import SqliteLoader, load_feed
+from greenbutton_objects.feed import serialize
+from greenbutton_objects.feed.feed import ObjectFeed
+from greenbutton_objects.feed.interval_decoder import decode_interval_block
+from greenbutton_objects.objects import DstRule, LocalTimeRules, QualityOfReading, ReadingColumns, ServiceKind
+from greenbutton_objects.objects.local_time import key_to_date
+from greenbutton_objects.objects.objects import (
+    DateTimeInterval,
+    IntervalBlock,
+    IntervalReading,
+    MeterReading,
+    UsagePoint,
+)
+from greenbutton_objects.objects.resample import resample
+from greenbutton_objects.profiling import ParseProfiler
+from greenbutton_objects.synthetic import FeedSpec, generate_feed, write_feed
+from greenbutton_objects.util import InternPool
+from xsdata.formats.dataclass.parsers import XmlParser
 
 from .helpers.feed_repr import parse_feed_representation
 
@@ -137,3 +171,836 @@ def test_gas_direct_pb(data_dir):
     assert (
         repr.split("\n")[3] == "    2024-07-16 18:26:24+00:00, 30 days, 0:00:00: 15 therm($33.06) [VALIDATED]"
     )
+
+
+def test_xml_parser_cache(data_dir):
+    """
+    Parsers share one pre-warmed context and are reused within a thread
+    """
+    context = parse.warmup()
+
+    parser = parse.get_xml_parser()
+    assert parser is parse.get_xml_parser()
+    assert parser.context is context
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_parser = executor.submit(parse.get_xml_parser).result()
+    assert other_parser is not parser
+    assert other_parser.context is context
+
+    data_file = data_dir / "abridged" / "gas_direct.xml"
+    usage_points = parse.parse_feed(str(data_file)).usage_points
+    assert len(usage_points[0].meter_readings[0].interval_readings) == 5
+
+
+def test_reading_columns(data_dir):
+    """
+    Meter readings expose their interval readings as columns
+    """
+    data_file = data_dir / "abridged" / "gas_containerized.xml"
+
+    mr = parse.parse_feed(str(data_file)).usage_points[0].meter_readings[0]
+    columns = mr.columns
+
+    assert len(columns) == len(mr.interval_readings) == 3
+    assert list(columns.value) == [reading.value for reading in mr.interval_readings]
+    assert columns.start[0] == int(mr.interval_readings[0].start.replace(tzinfo=timezone.utc).timestamp())
+    assert columns.cost[0] == 2806000
+    assert columns.quality[0] == QualityOfReading.VALIDATED.value
+    assert len(mr.intervalBlock[0].columns) == 1
+
+
+def test_interval_block_decoder_matches_generic_binding(data_dir):
+    """
+    The fast IntervalBlock decoder produces the same columns as the xsdata path
+    """
+    data_file = data_dir / "natural_gas" / "ngma_gas_provider_2024-07-16.xml"
+
+    generic_forest = EntryForest().build(HRefForest().build(parse.parse_xml(str(data_file))))
+    generic = ObjectFeed().build(generic_forest).usage_points[0].meter_readings[0]
+    decoded = parse.parse_feed(str(data_file)).usage_points[0].meter_readings[0]
+
+    assert len(decoded.columns) == len(generic.columns) == 36
+    assert decoded.columns.start == generic.columns.start
+    assert decoded.columns.duration == generic.columns.duration
+    assert decoded.columns.value == generic.columns.value
+    assert decoded.columns.cost == generic.columns.cost
+    assert decoded.columns.quality == generic.columns.quality
+
+
+def test_entry_forest_builds_repeatedly(data_dir):
+    """
+    Decoded readings stay on the forest, so it can be built more than once
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    entry_forest = parse.read_entry_forest(str(data_file))
+
+    feed = ObjectFeed().build(entry_forest)
+    again = list(feed.iter_usage_points(entry_forest))
+    other = ObjectFeed().build(entry_forest)
+    for usage_points in (feed.usage_points, again, other.usage_points):
+        assert len(usage_points[0].meter_readings[0].columns) == 8
+        assert len(usage_points[0].meter_readings[0].interval_readings) == 8
+    assert again[0].meter_readings[0].columns.value == feed.usage_points[0].meter_readings[0].columns.value
+
+
+def test_interval_block_decoder_tolerates_odd_readings():
+    """
+    Empty codes are missing and unknown quality codes warn, in both decoders
+    """
+    xml = (
+        '<IntervalBlock xmlns="http://naesb.org/espi"><IntervalReading>'
+        "<ReadingQuality><quality>99</quality></ReadingQuality>"
+        "<timePeriod><duration>900</duration><start>1000</start></timePeriod>"
+        "<value>5</value><tou/><cpp></cpp><consumptionTier/>"
+        "</IntervalReading></IntervalBlock>"
+    )
+    element = ElementTree.fromstring(xml)
+    interval_block = XmlParser().from_string(xml, espi.IntervalBlock)
+
+    with pytest.warns(UserWarning, match="99"):
+        decoded = decode_interval_block(element)
+    with pytest.warns(UserWarning, match="99"):
+        generic = ReadingColumns.from_espi(interval_block.interval_reading)
+
+    for columns in (decoded, generic):
+        assert list(columns.raw_value) == [5.0]
+        assert list(columns.quality) == [QualityOfReading.MISSING.value]
+        assert list(columns.tou) == list(columns.consumption_tier) == [-1]
+        assert list(columns.cpp) == [0]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parse_many(data_dir, tmp_path, executor):
+    """
+    Batch parsing keeps going past broken files and preserves submission order
+    """
+    broken_file = tmp_path / "broken.xml"
+    broken_file.write_text("<feed>")
+    paths = [
+        data_dir / "abridged" / "gas_direct.xml",
+        broken_file,
+        data_dir / "abridged" / "electric_containerized.xml",
+    ]
+
+    results = list(parse.parse_many(paths, workers=2, executor=executor))
+
+    assert [result.source for result in results] == [str(path) for path in paths]
+    assert results[1].feed is None
+    assert results[1].error is not None
+
+    mr = results[2].feed.usage_points[0].meter_readings[0]
+    assert len(mr.interval_readings) == 8
+    assert mr.interval_readings[0].value == 450
+    assert mr.interval_readings[0].parent is mr.intervalBlock[0]
+
+
+def test_entry_forest_deep_related_chain():
+    """
+    Building the entry forest does not recurse through related links
+    """
+    href_forest = HRefForest()
+    chain_length = 10 * sys.getrecursionlimit()
+    for index in range(chain_length):
+        related = [f"Chain/{index + 1}"] if index + 1 < chain_length else []
+        href_forest.forest[f"Chain/{index}"] = HRefTreeNode(uri=f"Chain/{index}", related=related)
+
+    roots = EntryForest().build(href_forest.link()).roots
+
+    node = roots[0]
+    for _ in range(chain_length - 1):
+        node = node.related[0]
+    assert node.uri == f"Chain/{chain_length - 1}"
+
+
+def test_entry_node_type_index(data_dir):
+    """
+    Indexed lookups by type match the linear scan over related nodes
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    entry_forest = EntryForest().build(HRefForest().build(parse.parse_xml(str(data_file))))
+
+    up_node = entry_forest.get_root_elements_by_type(espi.UsagePoint)[0]
+    assert up_node.related_by_type
+    for elements_type in (espi.MeterReading, espi.LocalTimeParameters, espi.ElectricPowerUsageSummary):
+        expected = list(EntryForest.get_elements_by_type(elements_type, up_node.related))
+        assert expected
+        assert list(up_node.get_related_of_type(elements_type)) == expected
+    assert list(up_node.get_related_of_type(espi.IntervalBlock)) == []
+
+
+def test_lazy_interval_readings(data_dir):
+    """
+    Lazy feeds only create IntervalReading objects when they are accessed
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+
+    mr = parse.parse_feed(str(data_file), lazy=True).usage_points[0].meter_readings[0]
+    iblock = mr.intervalBlock[0]
+
+    assert len(mr.columns) == 8
+    assert not any(ib.readings_materialized for ib in mr.intervalBlock)
+
+    assert len(iblock.readings) == 4
+    assert iblock.readings_materialized
+    assert not mr.intervalBlock[1].readings_materialized
+
+    assert mr.interval_readings[0] is iblock.readings[0]
+    assert mr.interval_readings[0].value == 450
+    assert mr.interval_readings[0].parent is iblock
+
+
+def test_readings_passed_to_init():
+    """
+    Readings passed in are kept and fill the columns
+    """
+    start = datetime(2024, 1, 1)
+    readings = [
+        IntervalReading(DateTimeInterval(start + timedelta(hours=i), timedelta(hours=1)), raw_value=i, tou=1)
+        for i in range(3)
+    ]
+    iblock = IntervalBlock("block", DateTimeInterval(start, timedelta(hours=3)), readings)
+
+    assert iblock.readings is readings
+    assert list(iblock.columns.raw_value) == [0, 1, 2]
+    assert list(iblock.columns.duration) == [3600] * 3
+    assert list(iblock.columns.tou) == [1] * 3
+
+    mr = MeterReading("title", "uri", espi.ReadingType(), tuple(readings))
+    assert mr.interval_readings == tuple(readings)
+    assert mr.intervalBlock == ()
+    assert list(mr.readings_between(start + timedelta(hours=1), start + timedelta(hours=3))) == readings[1:]
+
+    mr = MeterReading("title", "uri", espi.ReadingType(), intervalBlock=(iblock,))
+    mr.compute_multipliers()
+    assert mr.interval_readings == tuple(readings)
+    assert [reading.value for reading in mr.interval_readings] == [0, 1, 2]
+
+
+def test_parse_cache(data_dir, tmp_path):
+    """
+    Cached feeds match a fresh parse and are invalidated when the file changes
+    """
+    source = data_dir / "abridged" / "electric_containerized.xml"
+    data_file = tmp_path / "feed.xml"
+    data_file.write_bytes(source.read_bytes())
+    cache = ParseCache(tmp_path / "cache")
+
+    expected = parse_feed_representation(parse.parse_feed(str(data_file)))
+    assert parse_feed_representation(cache.parse_feed(str(data_file))) == expected
+    entries = list(cache.directory.glob("*.gbof"))
+    assert len(entries) == 1
+    assert parse_feed_representation(cache.parse_feed(str(data_file))) == expected
+
+    entries[0].write_bytes(b"corrupt")
+    assert parse_feed_representation(cache.parse_feed(str(data_file))) == expected
+
+    data_file.write_bytes((data_dir / "abridged" / "gas_direct.xml").read_bytes())
+    feed = cache.parse_feed(str(data_file))
+    assert feed.usage_points[0].service_kind == ServiceKind.GAS
+    assert len(list(cache.directory.glob("*.gbof"))) == 2
+
+    cache.max_bytes = 1
+    cache.evict()
+    assert list(cache.directory.glob("*.gbof")) == []
+
+
+def test_parse_profiler(data_dir):
+    """
+    The profiler reports every parse_feed stage with its object counts
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    reported = []
+    profiler = ParseProfiler(on_stage=reported.append, trace_memory=True)
+
+    feed = parse.parse_feed(str(data_file), profiler=profiler)
+
+    assert [stats.name for stats in profiler.stages] == ["read", "link", "entry_forest", "build"]
+    assert reported == profiler.stages
+    for stats in profiler.stages:
+        assert stats.wall_time >= 0
+        assert stats.peak_memory is not None and stats.peak_memory >= 0
+
+    read, link, entry_forest, build = profiler.stages
+    assert read.counts["entries"] == 7
+    assert entry_forest.counts["nodes"] == link.counts["href_nodes"]
+    assert build.counts["usage_points"] == len(feed.usage_points) == 1
+    assert build.counts["interval_blocks"] == 2
+    assert build.counts["readings"] == 8
+    assert "entry_forest" in profiler.report()
+
+
+@pytest.mark.parametrize("containerized", [True, False])
+def test_synthetic_feed(tmp_path, containerized):
+    """
+    Synthetic feeds parse back into the requested shape in both atom styles
+    """
+    spec = FeedSpec(
+        usage_points=2,
+        meter_readings=2,
+        interval_length=900,
+        span=2 * 86400 + 3600,
+        service_kind=ServiceKind.GAS,
+        containerized=containerized,
+        cost=True,
+        quality=True,
+        tou=True,
+    )
+    data_file = tmp_path / "synthetic.xml.gz"
+    assert write_feed(spec, data_file) == spec.total_readings == 4 * 196
+
+    feed = parse.parse_feed(str(data_file))
+
+    assert len(feed.usage_points) == 2
+    for up in feed.usage_points:
+        assert up.service_kind == ServiceKind.GAS
+        assert up.local_time_parameters is not None
+        assert len(up.meter_readings) == 2
+        for mr in up.meter_readings:
+            assert mr.uom_symbol.strip() == "therm"
+            assert len(mr.intervalBlock) == 3
+            columns = mr.columns
+            assert len(columns) == 196
+            assert list(columns.start) == [spec.start + i * 900 for i in range(196)]
+            assert not any(isnan(cost) for cost in columns.cost)
+            assert QualityOfReading.MISSING.value not in columns.quality
+            assert set(columns.tou) == {1, 2}
+
+    assert parse_feed_representation(parse.parse_feed(generate_feed(spec))) == parse_feed_representation(feed)
+
+    # Valid atom: entries have an id and dates, content is typed
+    atom_feed = parse.get_xml_parser().from_bytes(generate_feed(spec), atom.Feed)
+    assert atom_feed.updated and atom_feed.id
+    ids = set()
+    for atom_entry in atom_feed.entry:
+        (entry_id,) = atom_entry.id
+        assert entry_id.value.startswith("urn:uuid:")
+        ids.add(uuid.UUID(entry_id.value[len("urn:uuid:") :]))
+        assert atom_entry.published and atom_entry.updated
+        assert atom_entry.content[0].type_value == "xml"
+    assert len(ids) == len(atom_feed.entry)
+
+
+def test_resample_partial_intervals():
+    """
+    Readings straddling bucket edges are split in proportion to their overlap
+    """
+    day = 86400
+    columns = ReadingColumns(
+        start=array("q", [0, 12 * 3600, day + 12 * 3600]),
+        duration=array("i", [12 * 3600, day, 12 * 3600]),
+        raw_value=array("d", [10.0, 40.0, float("NaN")]),
+    )
+    columns.scale(1.0)
+
+    buckets = resample(columns, "day")
+    assert list(buckets.start) == [0, day]
+    assert list(buckets.duration) == [day, day]
+    assert list(buckets.value) == [30.0, 20.0]
+
+    assert list(resample(columns, "day", how="count").value) == [1.5, 0.5]
+    assert list(resample(columns, "day", how="mean").value) == [20.0, 40.0]
+    assert list(resample(columns, "day", how="max").value) == [40.0, 40.0]
+    assert list(resample(columns, "day", how="min").value) == [10.0, 40.0]
+    assert list(resample(columns, "day", prorate=False).value) == [50.0]
+    assert list(resample(columns, timedelta(hours=6)).value) == [5.0, 5.0, 10.0, 10.0, 10.0, 10.0]
+
+    with pytest.raises(ValueError):
+        resample(columns, "fortnight")
+
+
+def test_meter_reading_resample(data_dir):
+    """
+    Calendar buckets follow the wall clock of the requested time zone
+    """
+    data_file = data_dir / "electricity" / "TestGBDataHourlyNineDaysBinnedDaily.xml"
+    mr = parse.parse_feed(str(data_file)).usage_points[0].meter_readings[0]
+
+    # The readings cover nine days of the US eastern time zone
+    eastern = timezone(timedelta(hours=-5))
+    local_daily = mr.resample("day", tz=eastern)
+    assert len(local_daily) == 9
+    assert all(datetime.fromtimestamp(start, eastern).hour == 0 for start in local_daily.start)
+    assert list(mr.resample("day", tz=eastern, how="count").value) == [24.0] * 9
+
+    utc_daily = mr.resample("day")
+    assert len(utc_daily) == 10
+    assert all(duration == 86400 for duration in utc_daily.duration)
+    assert sum(utc_daily.value) == pytest.approx(sum(local_daily.value)) == sum(mr.columns.value)
+
+    monthly = mr.resample("month", how="count")
+    assert list(monthly.value) == [len(mr.columns)]
+
+
+def test_dst_rule_decode():
+    """
+    ESPI DST rules decode to the North American transition dates
+    """
+    start = DstRule.decode(bytes.fromhex("360E2000"))
+    end = DstRule.decode("B40E2000")
+
+    assert (start.month, start.day_of_week, start.hour) == (3, 7, 2)
+    assert start.day(2011) == date(2011, 3, 13)
+    assert start.day(2024) == date(2024, 3, 10)
+    assert end.day(2011) == date(2011, 11, 6)
+    assert end.day(2024) == date(2024, 11, 3)
+    # Last Sunday of October at 1:00
+    assert DstRule.decode((10 << 28) | (6 << 25) | (7 << 17) | (1 << 12)).day(2024) == date(2024, 10, 27)
+
+    with pytest.raises(ValueError):
+        DstRule.decode("00000000")
+
+
+@pytest.mark.parametrize(
+    "operator, day_of_month, expected",
+    [
+        (0, 10, 10),
+        (1, 10, 10),
+        (1, 11, 17),
+        (2, 10, 3),
+        (3, 10, 10),
+        (5, 10, 24),
+        (6, 10, 31),
+        (7, 10, 10),
+        (7, 9, 3),
+        (7, 0, 31),
+    ],
+)
+def test_dst_rule_operators(operator, day_of_month, expected):
+    """
+    Operators pick the Sunday of March 2024 relative to the day of month or the month
+    """
+    rule = DstRule(month=3, operator=operator, day_of_month=day_of_month, day_of_week=7, hour=2, seconds=0)
+    assert rule.day(2024) == date(2024, 3, expected)
+
+
+@pytest.mark.parametrize("rule", ["FFFFFFFF", "00000000"])
+@pytest.mark.parametrize("dst_offset", [0, 3600])
+def test_local_time_without_dst(rule, dst_offset):
+    """
+    All ones and all zeros DST rules, and a zero DST offset, mean no DST
+    """
+    params = LocalTimeParameters(
+        dst_end_rule=bytes.fromhex(rule),
+        dst_offset=dst_offset,
+        dst_start_rule=bytes.fromhex(rule),
+        tz_offset=-5 * 3600,
+    )
+    rules = LocalTimeRules.from_espi(params)
+
+    assert rules.dst_offset == 0
+    assert list(rules.offsets([0, 1_720_000_000])) == [-5 * 3600] * 2
+
+    up = UsagePoint("title", "uri", (), ServiceKind.ELECTRICITY, local_time_parameters=params)
+    assert up.local_time is rules
+
+
+def test_local_time_zero_dst_offset():
+    """
+    Valid rules are not applied without a DST offset, malformed ones still raise
+    """
+    assert LocalTimeRules.from_espi(
+        LocalTimeParameters(
+            dst_end_rule=bytes.fromhex("B40E2000"),
+            dst_offset=0,
+            dst_start_rule=bytes.fromhex("360E2000"),
+            tz_offset=0,
+        )
+    ).offsets([1_720_000_000]) == array("q", [0])
+
+    with pytest.raises(ValueError):
+        LocalTimeRules.from_espi(
+            LocalTimeParameters(
+                dst_end_rule=bytes.fromhex("F40E2000"),
+                dst_offset=3600,
+                dst_start_rule=bytes.fromhex("360E2000"),
+                tz_offset=0,
+            )
+        )
+
+
+def test_local_time_rules(data_dir):
+    """
+    Local time follows the LocalTimeParameters of the usage point
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    up = parse.parse_feed(str(data_file)).usage_points[0]
+    rules = up.local_time
+    assert rules is not None
+    assert rules is LocalTimeRules.from_espi(up.local_time_parameters)
+
+    # 2011-03-13 02:00 PST and 2011-11-06 02:00 PDT
+    dst_start, dst_end = 1300010400, 1320570000
+    starts = [dst_start - 1, dst_start, dst_end - 1, dst_end]
+    expected = [-8 * 3600, -7 * 3600, -7 * 3600, -8 * 3600]
+    assert list(rules.offsets(starts)) == expected
+    assert list(rules.offsets(starts[::-1])) == expected[::-1]
+    assert list(rules.to_local(starts)) == [start + offset for start, offset in zip(starts, expected)]
+
+    local_days = rules.local_day_keys(up.meter_readings[0].columns.start)
+    assert [key_to_date(key) for key in local_days] == [date(2011, 1, 1)] * 8
+    assert list(rules.local_hour_keys([dst_start])) == [(dst_start - 7 * 3600) // 3600]
+
+    tz = rules.tzinfo()
+    assert datetime.fromtimestamp(dst_start, tz).hour == 3
+    assert datetime(2011, 7, 1, tzinfo=tz).utcoffset() == timedelta(hours=-7)
+    assert datetime(2011, 1, 1, tzinfo=tz).timestamp() == 1293868800
+
+
+def test_interval_reading_epoch(data_dir):
+    """
+    Reading timestamps are normalized to epoch seconds once
+    """
+    data_file = data_dir / "natural_gas" / "ngma_gas_provider_2024-07-16.xml"
+    reading = parse.parse_feed(str(data_file)).usage_points[0].meter_readings[0].interval_readings[0]
+
+    # The feed has fractional start timestamps
+    assert reading.start_epoch == 1721154384
+    assert reading.end_epoch == 1721154384 + 2505600
+    assert reading.start == datetime(2024, 7, 16, 18, 26, 24)
+    assert reading.start is reading.start
+
+    quirky = IntervalReading(
+        time_period=espi.DateTimeInterval(start="1721154384.66136", duration=60), raw_value=1
+    )
+    assert (quirky.start_epoch, quirky.end_epoch) == (1721154384, 1721154444)
+    typed = IntervalReading(
+        time_period=DateTimeInterval(start=datetime(2024, 7, 16), duration=timedelta(hours=1)), raw_value=1
+    )
+    assert (typed.start_epoch, typed.end_epoch) == (1721088000, 1721091600)
+    assert typed.start == datetime(2024, 7, 16)
+
+
+def test_readings_between(data_dir):
+    """
+    Time range queries return the readings starting in the range, in start order
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    up = parse.parse_feed(str(data_file)).usage_points[0]
+    mr = up.meter_readings[0]
+
+    first = mr.interval_readings[0].start_epoch
+    readings = mr.readings_between(first + 3600, first + 4 * 3600)
+    assert [r.start_epoch for r in readings] == [first + 3600, first + 7200, first + 10800]
+    assert isinstance(mr.time_index.positions(first, first + 3600), range)
+    assert readings[1:][0] is mr.interval_readings[2]
+    assert len(mr.readings_between(datetime(2011, 1, 1, 8), datetime(2011, 1, 1, 20))) == 4
+    assert len(mr.readings_between(first + 3600, first)) == 0
+
+    (per_meter,) = up.readings_between(first, first + 86400)
+    assert list(per_meter) == list(mr.interval_readings)
+
+    # Overlapping IntervalBlocks listed out of order
+    blocks = mr.intervalBlock
+    shuffled = MeterReading(
+        title=mr.title,
+        uri=mr.uri,
+        reading_type=mr.reading_type,
+        intervalBlock=(blocks[1], blocks[0], blocks[0]),
+    )
+    assert shuffled.time_index.order is not None
+    starts = [r.start_epoch for r in shuffled.readings_between(first, first + 86400)]
+    assert starts == sorted(starts) and len(starts) == 12
+    assert [r.start_epoch for r in shuffled.readings_between(first, first + 3600)] == [first, first]
+
+    # Lazy feeds only materialize the blocks of the readings that are accessed
+    lazy = parse.parse_feed(str(data_file), lazy=True).usage_points[0].meter_readings[0]
+    last_block = lazy.intervalBlock[1]
+    readings = lazy.readings_between(last_block.columns.start[1], last_block.columns.start[3] + 1)
+    assert not any(ib.readings_materialized for ib in lazy.intervalBlock)
+    assert [r.start_epoch for r in readings] == list(last_block.columns.start[1:])
+    assert readings[-1] is last_block.readings[3]
+    assert not lazy.intervalBlock[0].readings_materialized
+    assert "interval_readings" not in vars(lazy)
+
+
+def test_parquet_export(data_dir, tmp_path):
+    """
+    Readings stream to Parquet with dictionary encoded URIs and nullable codes
+    """
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    from greenbutton_objects.export import arrow
+
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    feed = parse.parse_feed(str(data_file))
+    mr = feed.usage_points[0].meter_readings[0]
+
+    batches = list(arrow.iter_record_batches(feed, batch_size=5))
+    assert [batch.num_rows for batch in batches] == [5, 3]
+
+    path = tmp_path / "readings.parquet"
+    assert arrow.write_parquet(feed, path, row_group_size=5) == 8
+    assert pq.ParquetFile(path).num_row_groups == 2
+
+    # Parquet has no second resolution timestamps, reading with the schema restores them
+    table = pq.read_table(path, schema=arrow.SCHEMA)
+    assert table.schema.field("meter_reading").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.column("raw_value").to_pylist() == list(mr.columns.raw_value)
+    assert table.column("start").cast(pa.int64()).to_pylist() == list(mr.columns.start)
+    assert table.column("uom").to_pylist() == ["Wh"] * 8
+    assert table.column("tou").null_count == 8
+    assert table.equals(arrow.to_table(feed))
+
+    # Missing readings are null like missing costs
+    mr.columns.raw_value[0] = mr.columns.value[0] = float("NaN")
+    (batch,) = arrow.iter_record_batches(feed)
+    assert batch.column("raw_value").null_count == batch.column("value").null_count == 1
+    assert batch.column("raw_value")[1].as_py() == mr.columns.raw_value[1]
+
+
+def test_text_export(data_dir, tmp_path):
+    """
+    CSV and NDJSON exports stream rows from parsed or streamed feeds, optionally gzipped
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+
+    path = tmp_path / "readings.csv.gz"
+    assert text.write_csv(parse.parse_feed_stream(str(data_file)), path) == 8
+    with gzip.open(path, "rt", newline="") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert len(rows) == 8
+    assert rows[0]["start"] == "2011-01-01T08:00:00+00:00"
+    assert rows[0]["raw_value"] == "450.0" and rows[0]["uom"] == "Wh"
+    assert rows[0]["tou"] == "" and rows[0]["cpp"] == "0"
+
+    out = io.StringIO()
+    assert text.write_ndjson(parse.parse_feed(str(data_file)), out, chunk_size=3) == 8
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["start"] for record in records] == [row["start"] for row in rows]
+    assert records[0]["cost"] is None and records[0]["value"] == 450.0
+
+    # Missing readings are null, not the invalid JSON NaN
+    feed = parse.parse_feed(str(data_file))
+    columns = feed.usage_points[0].meter_readings[0].intervalBlock[0].columns
+    columns.raw_value[0] = columns.value[0] = float("NaN")
+    out = io.StringIO()
+    text.write_ndjson(feed, out)
+    record = json.loads(out.getvalue().splitlines()[0], parse_constant=pytest.fail)
+    assert record["raw_value"] is None and record["value"] is None
+
+
+def test_sqlite_loader(data_dir, tmp_path):
+    """
+    Loading upserts resources by URI and replaces the readings of reloaded blocks
+    """
+    electric = parse.parse_feed(str(data_dir / "abridged" / "electric_containerized.xml"))
+    gas = parse.parse_feed(str(data_dir / "abridged" / "gas_direct.xml"))
+
+    path = tmp_path / "greenbutton.db"
+    with SqliteLoader(path) as loader:
+        assert loader.load(electric) == 8
+        assert loader.load(electric) == 8
+        assert loader.load(parse.parse_feed_stream(str(data_dir / "abridged" / "gas_direct.xml"))) == 5
+
+    assert load_feed(gas, path) == 5
+    connection = sqlite3.connect(path)
+    counts = {
+        table: connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+        for table in ("usage_point", "meter_reading", "reading_type", "interval_block", "interval_reading")
+    }
+    assert counts == {
+        "usage_point": 2,
+        "meter_reading": 2,
+        "reading_type": 2,
+        "interval_block": len(electric.usage_points[0].meter_readings[0].intervalBlock) + 1,
+        "interval_reading": 13,
+    }
+    mr = electric.usage_points[0].meter_readings[0]
+    rows = connection.execute(
+        "SELECT r.start, r.raw_value, r.tou FROM interval_reading r"
+        " JOIN interval_block b ON b.id = r.interval_block_id"
+        " JOIN meter_reading m ON m.id = b.meter_reading_id"
+        " WHERE m.uri = ? ORDER BY r.start",
+        (mr.uri,),
+    ).fetchall()
+    assert rows == [(start, value, None) for start, value in zip(mr.columns.start, mr.columns.raw_value)]
+    connection.close()
+
+
+def test_sqlite_loader_reading_types(data_dir):
+    """
+    Reading types that differ in any field are stored apart
+    """
+    feed = parse.parse_feed(str(data_dir / "abridged" / "electric_containerized.xml"))
+    reading_type = feed.usage_points[0].meter_readings[0].reading_type
+
+    with SqliteLoader(sqlite3.connect(":memory:")) as loader:
+        for tou in (1, 2, 1):
+            reading_type.tou = tou
+            loader.load(feed)
+        rows = loader.connection.execute("SELECT key, uom FROM reading_type ORDER BY id").fetchall()
+    assert [json.loads(key)["tou"] for key, _ in rows] == [1, 2]
+    assert [uom for _, uom in rows] == [reading_type.uom.value] * 2
+
+
+@pytest.mark.parametrize(
+    "feed_file", ["abridged/gas_containerized.xml", "natural_gas/ngma_gas_provider_2024-07-16.xml"]
+)
+def test_sqlite_loader_blocks_sharing_an_entry(data_dir, tmp_path, feed_file):
+    """
+    IntervalBlocks of one entry share its URI and are kept apart by their position
+    """
+    feed = parse.parse_feed(str(data_dir / feed_file))
+    (mr,) = [mr for up in feed.usage_points for mr in up.meter_readings if len(mr.intervalBlock) > 1]
+    assert len({ib.uri for ib in mr.intervalBlock}) < len(mr.intervalBlock)
+
+    path = tmp_path / "greenbutton.db"
+    total = sum(len(mr.columns) for up in feed.usage_points for mr in up.meter_readings)
+    assert load_feed(feed, path) == total
+    assert load_feed(feed, path) == total
+
+    connection = sqlite3.connect(path)
+    rows = connection.execute(
+        "SELECT b.uri, b.position, count(*) FROM interval_reading r"
+        " JOIN interval_block b ON b.id = r.interval_block_id"
+        " JOIN meter_reading m ON m.id = b.meter_reading_id"
+        " WHERE m.uri = ? GROUP BY b.id ORDER BY b.id",
+        (mr.uri,),
+    ).fetchall()
+    assert [(uri, count) for uri, _, count in rows] == [(ib.uri, len(ib.columns)) for ib in mr.intervalBlock]
+    assert len({(uri, position) for uri, position, _ in rows}) == len(mr.intervalBlock)
+    assert connection.execute("SELECT count(*) FROM interval_reading").fetchone()[0] == total
+    connection.close()
+
+
+def test_object_feed_bytes(data_dir, tmp_path):
+    """
+    ObjectFeed round trips through its binary form, from bytes or a memory-mapped file
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    feed = parse.parse_feed(str(data_file))
+    expected = parse_feed_representation(feed)
+
+    data = feed.to_bytes()
+    assert parse_feed_representation(ObjectFeed.from_bytes(data)) == expected
+    assert parse_feed_representation(ObjectFeed.from_bytes(bytearray(data), lazy=True)) == expected
+
+    path = tmp_path / "feed.gbof"
+    path.write_bytes(data)
+    loaded = serialize.load(path, lazy=True)
+    assert parse_feed_representation(loaded) == expected
+    loaded_columns = loaded.usage_points[0].meter_readings[0].columns
+    columns = feed.usage_points[0].meter_readings[0].columns
+    assert loaded_columns.cost.tobytes() == columns.cost.tobytes()
+    assert loaded_columns.start == columns.start and loaded_columns.value == columns.value
+
+    # Every load decodes its own ESPI objects
+    first, second = (ObjectFeed.from_bytes(data).usage_points[0] for _ in range(2))
+    first.meter_readings[0].reading_type.uom = espi.UnitSymbolKindValue.VALUE_169
+    assert second.meter_readings[0].reading_type == feed.usage_points[0].meter_readings[0].reading_type
+    assert first.local_time_parameters is not second.local_time_parameters
+
+    with pytest.raises(serialize.SerializationError):
+        ObjectFeed.from_bytes(data[:-8])
+    with pytest.raises(serialize.SerializationError):
+        ObjectFeed.from_bytes(b"GBOF")
+
+
+def test_compact_blocks(data_dir):
+    """
+    Slotted blocks and readings carry the same data as the regular ones
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    mr = parse.parse_feed(str(data_file), lazy=True).usage_points[0].meter_readings[0]
+
+    blocks = mr.compact_blocks()
+    assert blocks[0].columns is mr.intervalBlock[0].columns
+    readings = [reading for block in blocks for reading in block.readings]
+    assert not hasattr(readings[0], "__dict__") and not hasattr(blocks[0], "__dict__")
+    assert [r.start for r in readings] == [r.start for r in mr.interval_readings]
+    assert [r.end_epoch for r in readings] == [r.end_epoch for r in mr.interval_readings]
+    assert [r.raw_value for r in readings] == [r.raw_value for r in mr.interval_readings]
+    assert readings[0].value == mr.columns.value[0]
+    assert readings[0].reading_type is mr.reading_type
+    assert readings[0].quality_of_reading == mr.interval_readings[0].quality_of_reading
+    assert blocks[0].interval.duration == 43200
+
+    with pytest.raises(AttributeError):
+        readings[0].raw_value = 0.0
+
+    restored = pickle.loads(pickle.dumps(blocks[0]))
+    assert restored.uri == blocks[0].uri and restored.interval == blocks[0].interval
+    reading = pickle.loads(pickle.dumps(readings[0]))
+    assert (reading.start_epoch, reading.raw_value, reading.tou) == (readings[0].start_epoch, 450.0, None)
+    assert [r.raw_value for r in restored.readings] == [r.raw_value for r in blocks[0].readings]
+
+
+def test_interval_reading_value(data_dir):
+    """
+    Reading values survive repeated access and follow bulk rescaling of their meter reading
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    mr = parse.parse_feed(str(data_file)).usage_points[0].meter_readings[0]
+    reading = mr.interval_readings[0]
+    assert reading.value == 450
+    assert reading.value == 450
+
+    mr.reading_type.power_of_ten_multiplier = espi.UnitMultiplierKindValue.VALUE_MINUS_3
+    mr.compute_multipliers()
+    assert [r.value for r in mr.interval_readings] == [r.raw_value * 10.0**-3 for r in mr.interval_readings]
+    assert list(mr.columns.value) == [r.value for r in mr.interval_readings]
+
+    standalone = IntervalReading(time_period=reading.time_period, raw_value=2.0, parent=mr.intervalBlock[0])
+    assert standalone.value == 2.0 * 10.0**-3
+    with pytest.raises(ValueError):
+        IntervalReading(time_period=reading.time_period, raw_value=2.0).value
+
+
+def test_interned_feed_content(data_dir):
+    """
+    Feeds parsed with the same pool share their URIs, titles and equal ESPI objects
+    """
+    data_file = data_dir / "electricity" / "TestGBDataHourlyNineDaysBinnedDaily.xml"
+    pool = InternPool()
+    first = parse.parse_feed(str(data_file), pool=pool).usage_points[0]
+    second = parse.parse_feed(str(data_file), lazy=True, pool=pool).usage_points[0]
+
+    assert first.uri is second.uri
+    assert first.title is second.title
+    first_blocks = first.meter_readings[0].intervalBlock
+    second_blocks = second.meter_readings[0].intervalBlock
+    assert first_blocks[0].uri is second_blocks[0].uri
+    assert first.meter_readings[0].reading_type is second.meter_readings[0].reading_type
+    assert first.local_time_parameters is second.local_time_parameters
+    assert first.meter_readings[0].interval_readings[0].reading_type is second.meter_readings[0].reading_type
+
+    # Without a shared pool the ESPI objects of every feed are its own
+    other = parse.parse_feed(str(data_file)).usage_points[0]
+    assert other.meter_readings[0].reading_type == first.meter_readings[0].reading_type
+    assert other.meter_readings[0].reading_type is not first.meter_readings[0].reading_type
+    assert other.local_time_parameters is not first.local_time_parameters
+
+
+def test_scan_feed(data_dir):
+    """
+    Scanning summarizes a feed like a full parse without decoding its readings
+    """
+    data_file = data_dir / "electricity" / "TestGBDataHourlyNineDaysBinnedDaily.xml"
+    summary = parse.scan_feed(str(data_file))
+    feed = parse.parse_feed(str(data_file))
+
+    assert [up.uri for up in summary.usage_points] == [up.uri for up in feed.usage_points]
+    up_summary = summary.usage_points[0]
+    up = feed.usage_points[0]
+    assert up_summary.title == up.title
+    assert up_summary.service_kind == up.service_kind == ServiceKind.ELECTRICITY
+    assert up_summary.local_time_parameters == up.local_time_parameters
+
+    (mr_summary,) = up_summary.meter_readings
+    mr = up.meter_readings[0]
+    assert mr_summary.uri == mr.uri
+    assert mr_summary.reading_type == mr.reading_type
+    assert mr_summary.interval_blocks == len(mr.intervalBlock) == 9
+    assert mr_summary.readings == summary.readings == len(mr.columns) == 216
+    assert mr_summary.start == summary.start == min(mr.columns.start)
+    assert mr_summary.end == summary.end == max(mr.columns.start) + mr.columns.duration[-1]
+
+    gas_file = str(data_dir / "abridged" / "gas_containerized.xml")
+    gas = parse.scan_feed(gas_file)
+    assert gas.usage_points[0].service_kind == ServiceKind.GAS
+    assert gas.readings == 3
+    gas_reading_type = gas.usage_points[0].meter_readings[0].reading_type
+    assert gas_reading_type == parse.parse_feed(gas_file).usage_points[0].meter_readings[0].reading_type
+    assert gas_reading_type.uom == 169
+    assert gas_reading_type.power_of_ten_multiplier == espi.UnitMultiplierKindValue.VALUE_MINUS_3
@@ -6,13 +6,18 @@ to saved expected outputs to verify parsing and representation generation
 are working correctly.
 """
 
+import gzip
+import io
 import itertools
 import os
 import pathlib
+import threading
+import zipfile
 from pathlib import Path
 
 import pytest
 from greenbutton_objects import parse
+from greenbutton_objects.feed.feed import ObjectFeed
 
 from .helpers.feed_repr import parse_feed_representation
 
@@ -129,6 +134,84 @@ def test_abridged(data_dir, energy_source):
     check_file(data_file_name)
 
 
+@pytest.mark.parametrize(
+    "data_file_name", ["electric_containerized.xml", "gas_containerized.xml", "gas_direct.xml"]
+)
+def test_parse_feed_stream(data_dir, data_file_name):
+    """
+    Streaming parse produces the same usage points as the full parse
+    """
+    data_file = data_dir / "abridged" / data_file_name
+
+    expected = parse.parse_feed(str(data_file))
+    streamed = ObjectFeed()
+    streamed.usage_points = list(parse.parse_feed_stream(str(data_file)))
+
+    assert parse_feed_representation(streamed) == parse_feed_representation(expected)
+
+
+def _compressed_sources(data_file: Path, tmp_path: Path):
+    data = data_file.read_bytes()
+
+    gz_file = tmp_path / "feed.xml.gz"
+    gz_file.write_bytes(gzip.compress(data))
+    zip_file = tmp_path / "feed.zip"
+    with zipfile.ZipFile(zip_file, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("feed.xml", data)
+
+    return {
+        "path": data_file,
+        "bytes": data,
+        "memoryview": memoryview(data),
+        "file": io.BytesIO(data),
+        "gzip_path": gz_file,
+        "gzip_bytes": gz_file.read_bytes(),
+        "zip_path": zip_file,
+        "zip_file": io.BytesIO(zip_file.read_bytes()),
+    }
+
+
+@pytest.mark.parametrize(
+    "source_kind",
+    ["path", "bytes", "memoryview", "file", "gzip_path", "gzip_bytes", "zip_path", "zip_file"],
+)
+def test_parse_feed_sources(data_dir, tmp_path, source_kind):
+    """
+    Paths, in-memory buffers, file objects and compressed feeds all parse the same way
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    expected = parse_feed_representation(parse.parse_feed(str(data_file)))
+
+    source = _compressed_sources(data_file, tmp_path)[source_kind]
+
+    assert parse_feed_representation(parse.parse_feed(source)) == expected
+
+
+@pytest.mark.parametrize("source_kind", ["bytes", "gzip_bytes", "zip_file"])
+def test_parse_feed_pipe(data_dir, tmp_path, source_kind):
+    """
+    Unbuffered streams that cannot seek are buffered to detect their compression
+    """
+    data_file = data_dir / "abridged" / "electric_containerized.xml"
+    expected = parse_feed_representation(parse.parse_feed(str(data_file)))
+    data = _compressed_sources(data_file, tmp_path)[source_kind]
+    if isinstance(data, io.BytesIO):
+        data = data.getvalue()
+
+    read_fd, write_fd = os.pipe()
+
+    def write():
+        with open(write_fd, "wb") as pipe:
+            pipe.write(data)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    with open(read_fd, "rb", buffering=0) as pipe:
+        assert parse_feed_representation(parse.parse_feed(pipe)) == expected
+        assert not pipe.closed
+    writer.join()
+
+
 if __name__ == "__main__":
     save_expected_results("abridged")
     save_expected_results("electricity")